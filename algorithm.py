@@ -1,108 +1,91 @@
 import time
 from copy import deepcopy
-from constants import BROWN, WHITE
-
-transposition_table = {}
+from board import Board
+from constants import ROWS, COLS, WHITE, BROWN
+from engine import search
+from engine.bitboard import BitBoard, bits, row_col, square, pack, unpack
+from engine.pdn import from_fen, to_fen
+from piece import Piece
 
 def alpha_beta_pruning(board, max_depth, turn, mode):
     start_time = time.time()
-    time_limit = 2.8
-    previous_best_move = None
-    previous_best_piece = None
-
-    def alpha_beta(board, depth, alpha, beta, maximizing_player):
-        if depth == 0 or time.time() - start_time > time_limit or board.game_over(WHITE if maximizing_player else BROWN) != None:
-            return board.evaluate_state(maximizing_player), board, None
-
-        board.get_zobrist_key()
-        zobrist_key = (board.zobrist_key, depth)
-
-        if zobrist_key in transposition_table:
-            return transposition_table[zobrist_key]
-
-        if maximizing_player:
-            value = float('-inf')
-            best_move = None
-            best_piece = None
-            for state, piece in get_states(board, WHITE, mode):
-                new_value, _, _ = alpha_beta(state, depth - 1, alpha, beta, False)
-                if new_value > value:
-                    value = new_value
-                    best_move = state
-                    best_piece = piece
-                if value == float('inf'):
-                    break
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
-            transposition_table[zobrist_key] = (value, best_move, best_piece)
-            return value, best_move, best_piece
-        else:
-            value = float('inf')
-            best_move = None
-            best_piece = None
-            for state, piece in get_states(board, BROWN, mode):
-                new_value, _, _ = alpha_beta(state, depth - 1, alpha, beta, True)
-                if new_value < value:
-                    value = new_value
-                    best_move = state
-                    best_piece = piece
-                if value == float('-inf'):
-                    break
-                beta = min(beta, value)
-                if alpha >= beta:
-                    break
-            transposition_table[zobrist_key] = (value, best_move, best_piece)
-            return value, best_move, best_piece
-
-    best_move = None
-    best_piece = None
-
-    for depth in range(3, max_depth + 1):
-        _, best_move, best_piece = alpha_beta(board, depth, float('-inf'), float('inf'), turn == WHITE)
-        if best_move is not None:
-            previous_best_move = best_move
-            previous_best_piece = best_piece
-        if time.time() - start_time > time_limit:
-            break
-
+    best_move = search.alpha_beta_pruning(BitBoard.from_board(board, turn), max_depth, turn, mode)
     end_time = time.time()
     print(f"Time taken: {end_time - start_time}")
 
-    if best_move is None:
-        return previous_best_move, previous_best_piece
-
-    return best_move, best_piece
-
-def get_states(board, maximizing_player, mode):
-    states = []
-    turn = WHITE if maximizing_player else BROWN
-    pieces = board.get_pieces_color(turn)
-    for piece in pieces:
-        valid_moves = []
-        if mode == 1:
-            forced_moves = board.get_forced_valid_moves(piece.color)
-            if not forced_moves:
-                valid_moves = board.get_valid_moves(piece)
-            elif piece in forced_moves:
-                valid_moves = forced_moves[piece]
-            else:
+    return make_move(board, best_move)
+
+def make_move(board, move):
+    """
+    Funkcija primenjuje potez pretrage na kopiju table grafickog interfejsa.
+    Vraca novo stanje table i figuru koja je pomerena, kao sto `Game.ai_move` ocekuje.
+    - `board`: tabla grafickog interfejsa
+    - `move`: potez `(sa, na, maska pojedenih figura)`
+    """
+    if move is None:
+        return None, None
+    frm, to, captured = move
+    piece = board.get_piece(*row_col(frm))
+    new_board = deepcopy(board)
+    new_piece = new_board.get_piece(piece.row, piece.col)
+    captured_pieces = [new_board.get_piece(*row_col(sq)) for sq in bits(captured)]
+    new_board.move(new_piece, *row_col(to))
+    if captured_pieces:
+        new_board.remove(captured_pieces)
+    return new_board, piece
+
+def pack_board(board, turn):
+    """
+    Funkcija pakuje tablu grafickog interfejsa u jedan broj (vidi `engine.bitboard.pack`),
+    bez pravljenja `BitBoard` objekta.
+    - `board`: tabla grafickog interfejsa
+    - `turn`: igrac koji je na potezu
+    """
+    white = brown = queens = 0
+    for pieces in board.board:
+        for piece in pieces:
+            if piece == 0:
                 continue
-        else:
-            valid_moves = board.get_valid_moves(piece)
-        
-        if not valid_moves:
-            continue
-        
-        for move, capture in valid_moves.items():
-            new_board = deepcopy(board)
-            new_piece = new_board.get_piece(piece.row, piece.col)
-            new_board.move(new_piece, move[0], move[1])
-            if capture:
-                new_board.remove(capture)
-            states.append((new_board, piece))
-    
-    return states
+            bit = 1 << square(piece.row, piece.col)
+            if piece.color == WHITE:
+                white |= bit
+            else:
+                brown |= bit
+            if piece.queen:
+                queens |= bit
+    return pack(white, brown, queens, turn)
+
+def unpack_board(packed):
+    """
+    Funkcija vraca `(tabla grafickog interfejsa, igrac na potezu)` iz upakovane pozicije.
+    """
+    white, brown, queens, turn = unpack(packed)
+    board = Board()
+    board.board = [[0] * COLS for _ in range(ROWS)]
+    for sq in bits(white | brown):
+        row, col = row_col(sq)
+        piece = Piece(row, col, WHITE if white >> sq & 1 else BROWN)
+        if queens >> sq & 1:
+            piece.make_queen()
+        board.board[row][col] = piece
+    board.white_left = white.bit_count()
+    board.brown_left = brown.bit_count()
+    board.white_queens = (white & queens).bit_count()
+    board.brown_queens = (brown & queens).bit_count()
+    board.get_zobrist_key()
+    return board, turn
+
+def board_to_fen(board, turn):
+    """
+    Funkcija vraca tablu grafickog interfejsa u FEN obliku (vidi `engine.pdn.to_fen`).
+    """
+    return to_fen(BitBoard.from_packed(pack_board(board, turn)))
+
+def board_from_fen(fen):
+    """
+    Funkcija vraca `(tabla grafickog interfejsa, igrac na potezu)` iz pozicije u FEN obliku.
+    """
+    return unpack_board(from_fen(fen).pack())
 
 # def minimax(board, max_depth, turn, mode):
 #     start_time = time.time()
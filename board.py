@@ -1,7 +1,7 @@
 import pygame
 from constants import *
 from piece import Piece
-from zobrist_hashing import zobrist_table
+from engine.zobrist_hashing import zobrist_keys, key_index, piece_type
 
 class Board(object):
     def __init__(self):
@@ -67,30 +67,12 @@ class Board(object):
             for col in range(COLS):
                 piece = self.get_piece(row, col)
                 if piece != 0:
-                    if piece.color == WHITE:
-                        if piece.queen:
-                            key ^= zobrist_table[(row, col, 'white_queen')]
-                        else:
-                            key ^= zobrist_table[(row, col, 'white_pawn')]
-                    else:
-                        if piece.queen:
-                            key ^= zobrist_table[(row, col, 'brown_queen')]
-                        else:
-                            key ^= zobrist_table[(row, col, 'brown_pawn')]
+                    key ^= zobrist_keys[key_index(row, col, piece_type(piece.color, piece.queen))]
 
         self.zobrist_key = key
 
     def update_zobrist_key(self, piece, row, col):
-        if piece.color == WHITE:
-            if piece.queen:
-                self.zobrist_key ^= zobrist_table[(row, col, 'white_queen')]
-            else:
-                self.zobrist_key ^= zobrist_table[(row, col, 'white_pawn')]
-        else:
-            if piece.queen:
-                self.zobrist_key ^= zobrist_table[(row, col, 'brown_queen')]
-            else:
-                self.zobrist_key ^= zobrist_table[(row, col, 'brown_pawn')]
+        self.zobrist_key ^= zobrist_keys[key_index(row, col, piece_type(piece.color, piece.queen))]
 
     def draw(self, win):
         """
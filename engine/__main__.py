@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+from .bitboard import BitBoard, move_to_string
+from .book import OpeningBook
+from .constants import WHITE, BROWN
+from .levels import LEVELS, level_search
+from .pdn import from_fen, to_fen
+from .search import Search
+from .tablebase import Tablebase
+from .timecontrol import TimeControl
+from .transposition import TranspositionTable, load_table, save_table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine', description='Pretraga najboljeg poteza bez grafickog interfejsa.')
+    parser.add_argument('--position', help='fajl sa tablom u obliku Board.__str__ ("-" za standardni ulaz); podrazumevano pocetna pozicija')
+    parser.add_argument('--fen', help='pozicija u FEN obliku (npr. "B:W21-32:B1-12"), umesto --position i --turn')
+    parser.add_argument('--turn', choices=('white', 'brown'), default='brown', help='igrac koji je na potezu')
+    parser.add_argument('--mode', type=int, choices=(0, 1), default=1, help='1 ako je jedenje obavezno, 0 ako nije')
+    parser.add_argument('--depth', type=int, default=7, help='najveca dubina pretrage')
+    parser.add_argument('--time-limit', type=float, default=2.8, help='vreme za pretragu u sekundama')
+    parser.add_argument('--clock', type=float, help='preostalo vreme na satu partije u sekundama; vreme za potez se racuna iz njega umesto --time-limit')
+    parser.add_argument('--increment', type=float, default=0.0, help='dodatak na satu posle svakog poteza u sekundama')
+    parser.add_argument('--level', choices=list(LEVELS), help='nivo tezine (ogranicenje dubine i broja cvorova, ponovljiva pretraga) umesto --depth i --time-limit')
+    parser.add_argument('--nodes', type=int, help='najveci broj cvorova pretrage')
+    parser.add_argument('--book', help='fajl knjige otvaranja (python -m engine.book build)')
+    parser.add_argument('--tablebase', help='direktorijum sa tabelama zavrsnica (python -m engine.tablebase)')
+    parser.add_argument('--tablebase-pieces', type=int, default=4, help='najveci broj figura za tabele zavrsnica')
+    parser.add_argument('--table', help='fajl transpozicione tabele; ucitava se pre pretrage (ako postoji) i cuva posle nje')
+    parser.add_argument('--table-load-time', type=float, default=1.0, help='najduze vreme ucitavanja tabele u sekundama')
+    parser.add_argument('--stats', action='store_true', help='ispis statistike posle svake iteracije')
+    args = parser.parse_args(argv)
+
+    turn = WHITE if args.turn == 'white' else BROWN
+    if args.fen is not None:
+        board = from_fen(args.fen)
+    elif args.position is None:
+        board = BitBoard(turn=turn)
+    elif args.position == '-':
+        board = BitBoard.from_string(sys.stdin.read(), turn)
+    else:
+        with open(args.position) as f:
+            board = BitBoard.from_string(f.read(), turn)
+
+    print(board)
+    print(to_fen(board))
+    start_time = time.time()
+    book = OpeningBook(args.book) if args.book else None
+    tablebase = Tablebase(args.tablebase, args.tablebase_pieces) if args.tablebase else None
+    time_control = TimeControl(args.clock, args.increment) if args.clock is not None else None
+    callback = print if args.stats else None
+    if args.level is not None:
+        search, depth = level_search(args.level, callback=callback, book=book, tablebase=tablebase)
+    else:
+        search = Search(TranspositionTable(), time_limit=args.time_limit, callback=callback, book=book, tablebase=tablebase,
+                        time_control=time_control, node_limit=args.nodes)
+        depth = args.depth
+    # ponovljiva pretraga prazni tabelu pre pretrage, pa se tabela ne ucitava
+    if args.table is not None and os.path.exists(args.table) and not search.deterministic:
+        try:
+            print(f"Loaded {load_table(search.table, args.table, args.table_load_time)} table entries")
+        except ValueError as error:
+            print(error)
+    move = search.run(board, depth, args.mode)
+    if args.table is not None:
+        print(f"Saved {save_table(search.table, args.table)} table entries")
+    end_time = time.time()
+    if move is None:
+        print("Nema mogucih poteza")
+    else:
+        print(move_to_string(move))
+    print(f"Nodes: {search.nodes}")
+    print(f"Time taken: {end_time - start_time}")
+
+if __name__ == '__main__':
+    main()
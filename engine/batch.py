@@ -0,0 +1,217 @@
+import argparse
+import random
+import sys
+import time
+from .bitboard import (BitBoard, SQUARES, pack_bytes, EVEN_ROWS, ODD_ROWS, LEFT_EDGE, RIGHT_EDGE, FULL, PROMOTION_SQUARES,
+                       UP_LEFT, UP_RIGHT, DOWN_LEFT, UP_DIRECTIONS, DOWN_DIRECTIONS, EVAL_SCALE, PHASE_MOVE_WEIGHTS,
+                       WHITE_PAWN_VALUES, WHITE_QUEEN_VALUES, BROWN_PAWN_VALUES, BROWN_QUEEN_VALUES)
+from .constants import WHITE, BROWN
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# kolone niza pozicija: bele figure, braon figure, kraljice, 1 ako je beli na potezu
+# (isti raspored kao 16 bajtova upakovane pozicije u little-endian obliku)
+WHITE_WORD, BROWN_WORD, QUEENS_WORD, SIDE_WORD = range(4)
+
+if np is not None:
+    EVEN = np.uint32(EVEN_ROWS)
+    ODD = np.uint32(ODD_ROWS)
+    EVEN_NOT_RIGHT = np.uint32(EVEN_ROWS & ~RIGHT_EDGE)
+    ODD_NOT_LEFT = np.uint32(ODD_ROWS & ~LEFT_EDGE & FULL)
+    PROMOTION = np.uint32(PROMOTION_SQUARES)
+    SQUARE_SHIFTS = np.arange(SQUARES, dtype=np.uint32)
+    # tabele skorova po poljima, redom bele pesake, bele kraljice, braon pesake, braon kraljice: (4 * 32, 3)
+    PIECE_VALUES = np.array(WHITE_PAWN_VALUES + WHITE_QUEEN_VALUES + BROWN_PAWN_VALUES + BROWN_QUEEN_VALUES, dtype=np.int64)
+    MOVE_WEIGHTS = np.array(PHASE_MOVE_WEIGHTS, dtype=np.int64)
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Za grupnu evaluaciju potreban je paket numpy (pip install numpy)")
+
+def shift_array(mask, direction):
+    """
+    Funkcija pomera maske u nizu za jedno polje u zadatom smeru, isto kao `bitboard.shift`.
+    """
+    if direction == UP_LEFT:
+        return ((mask & EVEN) >> 4) | ((mask & ODD_NOT_LEFT) >> 5)
+    if direction == UP_RIGHT:
+        return ((mask & EVEN_NOT_RIGHT) >> 3) | ((mask & ODD) >> 4)
+    if direction == DOWN_LEFT:
+        return ((mask & EVEN) << 4) | ((mask & ODD_NOT_LEFT) << 3)
+    return ((mask & EVEN_NOT_RIGHT) << 5) | ((mask & ODD) << 4)
+
+def popcount(mask):
+    """
+    Funkcija vraca broj postavljenih bitova za svaki element niza 32-bitnih maski.
+    """
+    mask = mask - ((mask >> 1) & 0x55555555)
+    mask = (mask & 0x33333333) + ((mask >> 2) & 0x33333333)
+    mask = (mask + (mask >> 4)) & 0x0F0F0F0F
+    return ((mask * 0x01010101) >> 24).astype(np.int64)
+
+def pack_boards(boards):
+    """
+    Funkcija pakuje listu `BitBoard` tabli u niz oblika (N, 4) tipa uint32.
+    """
+    require_numpy()
+    return np.array([(board.white, board.brown, board.queens, board.turn == WHITE) for board in boards], dtype=np.uint32).reshape(-1, 4)
+
+def packed_array(positions):
+    """
+    Funkcija pretvara listu upakovanih pozicija (`BitBoard.pack`) u niz oblika (N, 4) tipa uint32.
+    """
+    require_numpy()
+    return np.frombuffer(b''.join(pack_bytes(packed) for packed in positions), dtype='<u4').astype(np.uint32).reshape(-1, 4)
+
+def destinations(start, group, opp, empty):
+    """
+    Funkcija vraca maske ciljnih polja za figure iz `start` (najvise jedna figura po poziciji)
+    koje se krecu u smerovima `group`: obicni potezi i sva polja na koja se doskace u nizu skokova,
+    kao kljucevi recnika iz `BitBoard.get_valid_moves`.
+    """
+    reach = np.zeros_like(start)
+    frontier = np.zeros_like(start)
+    for direction in group:
+        neighbor = shift_array(start, direction)
+        reach |= neighbor & empty
+        frontier |= shift_array(neighbor & opp, direction) & empty
+    while frontier.any():
+        reach |= frontier
+        jumps = np.zeros_like(start)
+        for direction in group:
+            jumps |= shift_array(shift_array(frontier, direction) & opp, direction) & empty
+        frontier = jumps
+    return reach
+
+def evaluate_batch(positions):
+    """
+    Funkcija vraca niz skorova za sve pozicije odjednom, isti kao `BitBoard.evaluate_state` za igraca na potezu
+    (do na gresku zaokruzivanja).
+    - `positions`: niz oblika (N, 4) tipa uint32 (vidi `pack_boards`)
+    """
+    require_numpy()
+    positions = np.asarray(positions, dtype=np.uint32).reshape(-1, 4)
+    white = positions[:, WHITE_WORD]
+    brown = positions[:, BROWN_WORD]
+    queens = positions[:, QUEENS_WORD]
+    white_to_move = positions[:, SIDE_WORD] != 0
+    empty = ~(white | brown)
+
+    values = np.zeros((len(positions), PIECE_VALUES.shape[1]), dtype=np.int64)
+    for kind, pieces in enumerate((white & ~queens, white & queens, brown & ~queens, brown & queens)):
+        occupied = ((pieces[:, None] >> SQUARE_SHIFTS) & 1).astype(np.int64)
+        values += occupied @ PIECE_VALUES[kind * SQUARES:(kind + 1) * SQUARES]
+
+    total = popcount(white | brown)
+    phase = np.where(total >= 20, 0, np.where(total >= 12, 1, 2))
+    value = values[np.arange(len(positions)), phase]
+    mobility_pawn, mobility_queen, promotion_bonus = MOVE_WEIGHTS[phase].T
+
+    moves = {}
+    for color, own, opp in ((WHITE, white, brown), (BROWN, brown, white)):
+        pawn_moves = np.zeros(len(positions), dtype=np.int64)
+        queen_moves = np.zeros(len(positions), dtype=np.int64)
+        promotable = np.zeros(len(positions), dtype=np.int64)
+        for sq in range(SQUARES):
+            start = own & np.uint32(1 << sq)
+            if not start.any():
+                continue
+            queen = (queens & np.uint32(1 << sq)) != 0
+            up_start = start if color == BROWN else np.where(queen, start, 0).astype(np.uint32)
+            down_start = start if color == WHITE else np.where(queen, start, 0).astype(np.uint32)
+            reach = destinations(up_start, UP_DIRECTIONS, opp, empty) | destinations(down_start, DOWN_DIRECTIONS, opp, empty)
+            count = popcount(reach)
+            pawn_moves += np.where(queen, 0, count)
+            queen_moves += np.where(queen, count, 0)
+            promotable += ~queen & ((reach & PROMOTION) != 0)
+        moves[color] = pawn_moves + queen_moves
+        sign = 1 if color == WHITE else -1
+        value += sign * (mobility_pawn * pawn_moves + mobility_queen * queen_moves + promotion_bonus * promotable)
+
+    scores = value / EVAL_SCALE
+    no_moves = np.where(white_to_move, moves[WHITE], moves[BROWN]) == 0
+    scores = np.where(no_moves, np.where(white_to_move, -100000.0, 100000.0), scores)
+    scores = np.where(white == 0, -100000.0, scores)
+    scores = np.where(brown == 0, 100000.0, scores)
+    return scores
+
+def evaluate_file(input_path, output_path, chunk=1 << 16):
+    """
+    Funkcija ocenjuje sve pozicije iz binarnog fajla sa po 16 bajtova po poziciji (vidi `pack_boards`)
+    i upisuje skorove kao float64, deo po deo da bi i veliki fajlovi stali u memoriju.
+    Vraca broj ocenjenih pozicija.
+    """
+    require_numpy()
+    positions = np.memmap(input_path, dtype='<u4', mode='r').reshape(-1, 4)
+    with open(output_path, 'wb') as output:
+        for start in range(0, len(positions), chunk):
+            evaluate_batch(positions[start:start + chunk]).astype('<f8').tofile(output)
+    return len(positions)
+
+def random_boards(count, seed=0, max_plies=80):
+    """
+    Funkcija vraca `count` pozicija dobijenih nasumicnim potezima od pocetne pozicije.
+    """
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = BitBoard(turn=BROWN)
+        mode = len(boards) % 2
+        for _ in range(rng.randint(0, max_plies)):
+            moves = board.generate_moves(board.turn, mode)
+            if not moves:
+                break
+            board.apply_move(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+def benchmark(count=100000, seed=0, batch_size=None):
+    """
+    Funkcija poredi grupnu evaluaciju sa evaluacijom jedne po jedne pozicije.
+    Pozicije se ocenjuju u grupama od `batch_size` (podrazumevano sve odjednom).
+    Vraca `(pozicija u sekundi pojedinacno, pozicija u sekundi grupno, najveca razlika skorova)`.
+    """
+    boards = random_boards(count, seed)
+    positions = pack_boards(boards)
+
+    start_time = time.time()
+    scalar = [board.evaluate_state(board.turn == WHITE) for board in boards]
+    scalar_time = time.time() - start_time
+
+    start_time = time.time()
+    batch_size = batch_size or count
+    scores = np.concatenate([evaluate_batch(positions[start:start + batch_size]) for start in range(0, count, batch_size)])
+    batch_time = time.time() - start_time
+
+    difference = float(np.max(np.abs(scores - np.array(scalar, dtype=np.float64))))
+    return count / scalar_time, count / batch_time, difference
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.batch', description='Grupna evaluacija pozicija (numpy).')
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('bench', help='poredjenje sa evaluacijom jedne po jedne pozicije')
+    bench.add_argument('--positions', type=int, default=100000, help='broj pozicija')
+    bench.add_argument('--seed', type=int, default=0)
+    bench.add_argument('--batch-size', type=int, help='velicina grupe; podrazumevano sve pozicije odjednom')
+    score = commands.add_parser('score', help='ocena svih pozicija iz binarnog fajla')
+    score.add_argument('input', help='fajl sa po 16 bajtova po poziciji (bele, braon, kraljice, beli na potezu)')
+    score.add_argument('output', help='fajl u koji se upisuju skorovi kao float64')
+    args = parser.parse_args(argv)
+
+    if args.command == 'score':
+        start_time = time.time()
+        count = evaluate_file(args.input, args.output)
+        print(f"{count} pozicija, {time.time() - start_time:.3f} s")
+        return
+
+    scalar_rate, batch_rate, difference = benchmark(args.positions, args.seed, args.batch_size)
+    print(f"pojedinacno: {scalar_rate:12.0f} pozicija/s")
+    print(f"grupno:      {batch_rate:12.0f} pozicija/s ({batch_rate / scalar_rate:.1f}x)")
+    print(f"najveca razlika skorova: {difference:.2e}")
+    sys.exit(0 if difference < 1e-6 else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from .bitboard import move_to_string
+from .positions import POSITIONS
+from .search import Search
+from .transposition import TranspositionTable
+
+BENCHMARK_POSITIONS = [
+    ("pocetna", 1),
+    ("sredina", 1),
+    ("sredina bez obaveznog jedenja", 0),
+    ("kraljice", 1),
+    ("visestruko jedenje", 1),
+]
+
+def measure(board, mode, max_depth, time_limit):
+    """
+    Funkcija pretrazuje poziciju sa praznom transpozicionom tabelom i vraca recnik sa merenjima.
+    """
+    search = Search(TranspositionTable(), time_limit)
+    start_time = time.time()
+    move = search.run(board, max_depth, mode)
+    elapsed = time.time() - start_time
+    table = search.table
+    return {
+        "depth": search.iterations[-1][0] if search.iterations else 0,
+        "time": round(elapsed, 4),
+        "nodes": search.nodes,
+        "nps": round(search.nodes / max(elapsed, 1e-9)),
+        "tt_hit_rate": round(table.hits / table.probes, 4) if table.probes else 0.0,
+        "move": move_to_string(move) if move is not None else None,
+    }
+
+def run_benchmark(max_depth=8, time_limit=1.0, repeat=3, positions=BENCHMARK_POSITIONS):
+    """
+    Funkcija meri pretragu svake pozicije do zadate dubine (bez vremenskog ogranicenja)
+    i u zadatom vremenu (bez ogranicenja dubine). Vraca recnik koji se cuva kao JSON.
+    Merenje do dubine se ponavlja `repeat` puta i zadrzava se najbrze, da bi se smanjio sum.
+    """
+    results = {}
+    for name, mode in positions:
+        board = POSITIONS[name]
+        results[name] = {
+            "mode": mode,
+            "fixed_depth": min((measure(board, mode, max_depth, float('inf')) for _ in range(repeat)),
+                               key=lambda result: result["time"]),
+            "fixed_time": measure(board, mode, 64, time_limit),
+        }
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "depth": max_depth,
+        "time_limit": time_limit,
+        "repeat": repeat,
+        "positions": results,
+    }
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Funkcija poredi dva merenja i vraca listu `(pozicija, opis, da li je pogorsanje)`.
+    Pogorsanje je pad broja cvorova u sekundi, rast vremena do dubine ili broja cvorova do dubine,
+    ili pad dostignute dubine u zadatom vremenu, veci od `threshold` (udeo, npr. 0.1 za 10%).
+    """
+    rows = []
+    for name, result in current["positions"].items():
+        if name not in baseline["positions"]:
+            continue
+        base = baseline["positions"][name]
+        checks = [
+            ("nps do dubine", base["fixed_depth"]["nps"], result["fixed_depth"]["nps"], -1),
+            ("vreme do dubine", base["fixed_depth"]["time"], result["fixed_depth"]["time"], 1),
+            ("cvorova do dubine", base["fixed_depth"]["nodes"], result["fixed_depth"]["nodes"], 1),
+            ("nps u vremenu", base["fixed_time"]["nps"], result["fixed_time"]["nps"], -1),
+            ("dubina u vremenu", base["fixed_time"]["depth"], result["fixed_time"]["depth"], -1),
+        ]
+        for label, old, new, sign in checks:
+            change = (new - old) / old if old else 0.0
+            rows.append((name, f"{label}: {old} -> {new} ({change:+.1%})", sign * change > threshold))
+        if base["fixed_depth"]["move"] != result["fixed_depth"]["move"]:
+            rows.append((name, f"potez: {base['fixed_depth']['move']} -> {result['fixed_depth']['move']}", False))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.benchmark', description='Merenje brzine pretrage na stalnom skupu pozicija.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='izmeri pretragu i sacuvaj rezultate kao JSON')
+    run.add_argument('--depth', type=int, default=8, help='dubina za merenje do dubine')
+    run.add_argument('--time-limit', type=float, default=1.0, help='vreme u sekundama za merenje u vremenu')
+    run.add_argument('--repeat', type=int, default=3, help='broj ponavljanja merenja do dubine')
+    run.add_argument('--output', default='-', help='izlazni fajl ("-" za standardni izlaz)')
+    check = commands.add_parser('compare', help='uporedi merenje sa sacuvanom osnovom')
+    check.add_argument('baseline', help='JSON fajl sa osnovnim merenjem')
+    check.add_argument('current', nargs='?', help='JSON fajl sa novim merenjem; ako nije zadat, meri se sada')
+    check.add_argument('--threshold', type=float, default=0.1, help='dozvoljeno pogorsanje kao udeo (0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmark(args.depth, args.time_limit, args.repeat)
+        text = json.dumps(results, indent=2)
+        if args.output == '-':
+            print(text)
+        else:
+            with open(args.output, 'w') as f:
+                f.write(text + "\n")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_benchmark(baseline["depth"], baseline["time_limit"], baseline.get("repeat", 3))
+    regressions = 0
+    for name, description, regression in compare(baseline, current, args.threshold):
+        regressions += regression
+        print(f"{name:30} {description}{'   POGORSANJE' if regression else ''}")
+    print(f"Pogorsanja: {regressions}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
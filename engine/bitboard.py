@@ -0,0 +1,712 @@
+import os
+from fractions import Fraction
+from .constants import ROWS, COLS, WHITE, BROWN
+from .zobrist_hashing import zobrist_keys, zobrist_side, WHITE_PAWN, WHITE_QUEEN, BROWN_PAWN, BROWN_QUEEN
+
+SQUARES = 32
+FULL = (1 << SQUARES) - 1
+
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+OPPOSITE = (DOWN_RIGHT, DOWN_LEFT, UP_RIGHT, UP_LEFT)
+
+def square(row, col):
+    """
+    Funkcija vraca indeks tamnog polja (0-31) za zadati red i kolonu.
+    """
+    return row * 4 + col // 2
+
+def row_col(sq):
+    """
+    Funkcija vraca red i kolonu za zadati indeks tamnog polja.
+    """
+    row = sq // 4
+    return row, 2 * (sq % 4) + (row + 1) % 2
+
+def bits(mask):
+    """
+    Generator koji vraca indekse postavljenih bitova, od najnizeg ka najvisem.
+    Redosled odgovara prolasku kroz tablu red po red.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def move_to_string(move):
+    """
+    Funkcija vraca potez u obliku `(red, kolona) -> (red, kolona)`, sa pojedenim figurama ako ih ima.
+    """
+    frm, to, captured = move
+    string = f"{row_col(frm)} -> {row_col(to)}"
+    if captured:
+        string += " x " + ", ".join(str(row_col(sq)) for sq in bits(captured))
+    return string
+
+EVEN_ROWS = sum(1 << sq for sq in range(SQUARES) if (sq // 4) % 2 == 0)
+ODD_ROWS = FULL ^ EVEN_ROWS
+LEFT_EDGE = sum(1 << sq for sq in range(SQUARES) if row_col(sq)[1] == 0)
+RIGHT_EDGE = sum(1 << sq for sq in range(SQUARES) if row_col(sq)[1] == COLS - 1)
+
+WHITE_START = sum(1 << sq for sq in range(SQUARES) if row_col(sq)[0] < 3)
+BROWN_START = sum(1 << sq for sq in range(SQUARES) if row_col(sq)[0] > 4)
+
+def shift(mask, direction):
+    """
+    Funkcija pomera sve figure iz maske za jedno polje u zadatom smeru.
+    Figure koje bi izasle sa table se odbacuju.
+    - `mask`: skup polja
+    - `direction`: jedan od UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT
+    """
+    if direction == UP_LEFT:
+        return ((mask & EVEN_ROWS) >> 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) >> 5)
+    if direction == UP_RIGHT:
+        return ((mask & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((mask & ODD_ROWS) >> 4)
+    if direction == DOWN_LEFT:
+        return (((mask & EVEN_ROWS) << 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) << 3)) & FULL
+    return (((mask & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((mask & ODD_ROWS) << 4)) & FULL
+
+NEIGHBOR = [[shift(1 << sq, direction).bit_length() - 1 for sq in range(SQUARES)] for direction in range(4)]
+UP_DIRECTIONS = (UP_LEFT, UP_RIGHT)
+DOWN_DIRECTIONS = (DOWN_LEFT, DOWN_RIGHT)
+
+PROMOTION_SQUARES = sum(1 << sq for sq in range(SQUARES) if row_col(sq)[0] in (0, ROWS - 1))
+
+WHITE_PAWN_KEYS, WHITE_QUEEN_KEYS, BROWN_PAWN_KEYS, BROWN_QUEEN_KEYS = (
+    zobrist_keys[piece * SQUARES:(piece + 1) * SQUARES].tolist() for piece in (WHITE_PAWN, WHITE_QUEEN, BROWN_PAWN, BROWN_QUEEN))
+
+# upakovana pozicija je jedan broj `bele | braon << 32 | kraljice << 64 | (beli na potezu) << 96`;
+# zapisana u 16 bajtova little-endian to je isti raspored kao red niza u `batch` (cetiri uint32)
+PACKED_BYTES = 16
+
+def pack(white, brown, queens, turn):
+    """
+    Funkcija pakuje poziciju u jedan broj (vidi PACKED_BYTES).
+    """
+    return white | brown << 32 | queens << 64 | (turn == WHITE) << 96
+
+def unpack(packed):
+    """
+    Funkcija vraca `(bele, braon, kraljice, igrac na potezu)` iz upakovane pozicije.
+    """
+    return packed & FULL, (packed >> 32) & FULL, (packed >> 64) & FULL, WHITE if packed >> 96 else BROWN
+
+def pack_bytes(packed):
+    return packed.to_bytes(PACKED_BYTES, 'little')
+
+def unpack_bytes(data):
+    return int.from_bytes(data, 'little')
+
+# tezine za svaku fazu igre, redom kao argumenti `evaluation_based_on_phase`
+PHASE_WEIGHTS = (
+    (10, 60, 5, 10, 5, 5, 10, 5, 15, 15),
+    (15, 75, 7.5, 20, 10, 15, 20, 10, 10, 10),
+    (20, 100, 10, 30, 10, 25, 20, 20, 10, 10),
+)
+
+# skorovi u tabelama su pomnozeni sa EVAL_SCALE, da bi 7.5 i 1 / rastojanje do promocije bili celi brojevi
+EVAL_SCALE = 840
+
+def get_phase(total_pieces):
+    """
+    Funkcija vraca fazu igre (indeks u PHASE_WEIGHTS) za zadati ukupan broj figura.
+    """
+    if total_pieces >= 20:
+        return 0
+    if total_pieces >= 12:
+        return 1
+    return 2
+
+def piece_square_value(sq, color, queen, weights):
+    """
+    Funkcija vraca deo skora figure iz `evaluation_based_on_phase` koji zavisi samo od polja na kojem je,
+    pomnozen sa EVAL_SCALE i sa znakom (braon figure su negativne).
+    Mobilnost i promocija u jednom potezu zavise od ostalih figura, pa se racunaju u `evaluate_state`.
+    """
+    pawn_weight, queen_weight, safe_pawn, safe_queen, _, _, promotion_bonus, defending_pieces, attacking_piece, center_piece = weights
+    row, col = row_col(sq)
+    value = Fraction(queen_weight if queen else pawn_weight)
+
+    if (row == 0 and color == WHITE) or (row == ROWS - 1 and color == BROWN) or col == 0 or col == COLS - 1:
+        value += safe_queen if queen else Fraction(safe_pawn)
+
+    if not queen:
+        distance = ROWS - 1 - row if color == WHITE else row
+        if distance:
+            value += Fraction(promotion_bonus, distance)
+
+    if (row <= 1 and color == WHITE) or (row >= ROWS - 2 and color == BROWN):
+        value += defending_pieces
+
+    if row == 0 and color == WHITE and (col == 1 or col == 5):
+        value += 2 * defending_pieces
+    elif row == ROWS - 1 and color == BROWN and (col == 2 or col == 6):
+        value += 2 * defending_pieces
+
+    if 2 <= row <= 5 and 2 <= col <= 5:
+        value += center_piece
+    elif color == WHITE and row >= ROWS - 3:
+        value += attacking_piece
+    elif color == BROWN and row <= 2:
+        value += attacking_piece
+
+    value *= EVAL_SCALE
+    assert value.denominator == 1
+    return int(value) if color == WHITE else -int(value)
+
+def piece_square_values(color, queen):
+    return [tuple(piece_square_value(sq, color, queen, weights) for weights in PHASE_WEIGHTS) for sq in range(SQUARES)]
+
+# za svako polje po jedan skor za svaku fazu igre
+WHITE_PAWN_VALUES = piece_square_values(WHITE, False)
+WHITE_QUEEN_VALUES = piece_square_values(WHITE, True)
+BROWN_PAWN_VALUES = piece_square_values(BROWN, False)
+BROWN_QUEEN_VALUES = piece_square_values(BROWN, True)
+
+# mobilnost pesaka, mobilnost kraljice i bonus za promociju u jednom potezu, pomnozeni sa EVAL_SCALE
+PHASE_MOVE_WEIGHTS = tuple((int(weights[4] * EVAL_SCALE), int(weights[5] * EVAL_SCALE), int(2 * weights[6] * EVAL_SCALE))
+                           for weights in PHASE_WEIGHTS)
+
+
+class BitBoard(object):
+    """
+    Tabla za pretragu predstavljena sa tri 32-bitna broja: bele figure, braon figure i kraljice.
+    Bit `i` odgovara tamnom polju `i`, polja su numerisana red po red sa leva na desno.
+    Potezi se generisu istim redosledom i sa istim pojedenim figurama kao u `board.Board`.
+    Zobrist kljuc, ukljucujuci i igraca na potezu, azurira se inkrementalno u `apply_move`,
+    kao i `values`, zbir skorova figura po poljima za svaku fazu igre.
+    Ako je `debug` postavljen (ili promenljiva okruzenja CHECKERS_DEBUG_ZOBRIST), posle svakog
+    poteza kljuc i zbirovi se proveravaju racunanjem od pocetka.
+    """
+    debug = bool(os.environ.get('CHECKERS_DEBUG_ZOBRIST'))
+
+    def __init__(self, white=WHITE_START, brown=BROWN_START, queens=0, turn=BROWN):
+        self.white = white
+        self.brown = brown
+        self.queens = queens
+        self.turn = turn
+        self.zobrist_key = 0
+        self.get_zobrist_key()
+        self.values = self.compute_values()
+
+    @classmethod
+    def from_board(cls, board, turn=BROWN):
+        """
+        Funkcija pravi BitBoard od table koju koristi graficki interfejs.
+        - `board`: objekat klase `board.Board`
+        - `turn`: igrac koji je na potezu
+        """
+        white = brown = queens = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board.get_piece(row, col)
+                if piece == 0:
+                    continue
+                bit = 1 << square(row, col)
+                if piece.color == WHITE:
+                    white |= bit
+                else:
+                    brown |= bit
+                if piece.queen:
+                    queens |= bit
+        return cls(white, brown, queens, turn)
+
+    @classmethod
+    def from_string(cls, string, turn=BROWN):
+        """
+        Funkcija pravi BitBoard od stringa u obliku koji vraca `Board.__str__`:
+        osam redova od po osam znakova `0`, `w`, `W`, `b` ili `B`.
+        - `string`: tabla kao tekst
+        - `turn`: igrac koji je na potezu
+        """
+        rows = [line.strip() for line in string.strip().splitlines()]
+        if len(rows) != ROWS or any(len(line) != COLS for line in rows):
+            raise ValueError(f"Tabla mora imati {ROWS} redova sa po {COLS} polja")
+        white = brown = queens = 0
+        for row, line in enumerate(rows):
+            for col, char in enumerate(line):
+                if char == "0":
+                    continue
+                if char not in "wWbB" or col % 2 != (row + 1) % 2:
+                    raise ValueError(f"Neispravno polje {char!r} u redu {row}, koloni {col}")
+                bit = 1 << square(row, col)
+                if char in "wW":
+                    white |= bit
+                else:
+                    brown |= bit
+                if char in "WB":
+                    queens |= bit
+        return cls(white, brown, queens, turn)
+
+    @classmethod
+    def from_packed(cls, packed):
+        """
+        Funkcija pravi BitBoard od upakovane pozicije (vidi `pack`).
+        """
+        return cls(*unpack(packed))
+
+    def pack(self):
+        return pack(self.white, self.brown, self.queens, self.turn)
+
+    def __str__(self):
+        """
+        Funkcija koja vraca string reprezentaciju table, u istom obliku kao `Board.__str__`.
+        """
+        string = ""
+        for row in range(ROWS):
+            for col in range(COLS):
+                if col % 2 != (row + 1) % 2:
+                    string += "0"
+                    continue
+                bit = 1 << square(row, col)
+                if self.white & bit:
+                    string += "W" if self.queens & bit else "w"
+                elif self.brown & bit:
+                    string += "B" if self.queens & bit else "b"
+                else:
+                    string += "0"
+            string += "\n"
+        return string
+
+    @property
+    def white_left(self):
+        return self.white.bit_count()
+
+    @property
+    def brown_left(self):
+        return self.brown.bit_count()
+
+    @property
+    def white_queens(self):
+        return (self.white & self.queens).bit_count()
+
+    @property
+    def brown_queens(self):
+        return (self.brown & self.queens).bit_count()
+
+    def compute_zobrist_key(self):
+        """
+        Funkcija racuna zobrist kljuc od pocetka, prolaskom kroz sve figure.
+        """
+        key = zobrist_side if self.turn == WHITE else 0
+        for sq in bits(self.white & ~self.queens):
+            key ^= WHITE_PAWN_KEYS[sq]
+        for sq in bits(self.white & self.queens):
+            key ^= WHITE_QUEEN_KEYS[sq]
+        for sq in bits(self.brown & ~self.queens):
+            key ^= BROWN_PAWN_KEYS[sq]
+        for sq in bits(self.brown & self.queens):
+            key ^= BROWN_QUEEN_KEYS[sq]
+        return key
+
+    def get_zobrist_key(self):
+        self.zobrist_key = self.compute_zobrist_key()
+
+    def check_zobrist_key(self):
+        """
+        Funkcija proverava da li se inkrementalni kljuc poklapa sa kljucem racunatim od pocetka.
+        """
+        expected = self.compute_zobrist_key()
+        if self.zobrist_key != expected:
+            raise AssertionError(f"Zobrist kljuc {self.zobrist_key:#x} se razlikuje od {expected:#x}\n{self}")
+
+    def compute_values(self):
+        """
+        Funkcija racuna zbirove skorova figura po poljima od pocetka, po jedan za svaku fazu igre.
+        """
+        values = [0] * len(PHASE_WEIGHTS)
+        for tables, mask in ((WHITE_PAWN_VALUES, self.white & ~self.queens), (WHITE_QUEEN_VALUES, self.white & self.queens),
+                             (BROWN_PAWN_VALUES, self.brown & ~self.queens), (BROWN_QUEEN_VALUES, self.brown & self.queens)):
+            for sq in bits(mask):
+                for phase, value in enumerate(tables[sq]):
+                    values[phase] += value
+        return tuple(values)
+
+    def check_values(self):
+        expected = self.compute_values()
+        if self.values != expected:
+            raise AssertionError(f"Zbirovi {self.values} se razlikuju od {expected}\n{self}")
+
+    def apply_move(self, move):
+        """
+        Funkcija odigrava potez na tabli i vraca zapis potreban za njegovo ponistavanje.
+        Zapis je `(sa, na, pojedene figure, pojedene kraljice, promocija, prethodni zobrist kljuc, prethodni zbirovi)`.
+        - `move`: potez `(sa, na, maska pojedenih figura)`
+        """
+        frm, to, captured = move
+        from_bit = 1 << frm
+        to_bit = 1 << to
+        previous_key = self.zobrist_key
+        key = previous_key ^ zobrist_side
+        captured_queens = self.queens & captured
+
+        if self.white & from_bit:
+            self.white ^= from_bit | to_bit
+            self.brown &= ~captured
+            own_pawn_keys, own_queen_keys = WHITE_PAWN_KEYS, WHITE_QUEEN_KEYS
+            opp_pawn_keys, opp_queen_keys = BROWN_PAWN_KEYS, BROWN_QUEEN_KEYS
+            own_pawn_values, own_queen_values = WHITE_PAWN_VALUES, WHITE_QUEEN_VALUES
+            opp_pawn_values, opp_queen_values = BROWN_PAWN_VALUES, BROWN_QUEEN_VALUES
+        else:
+            self.brown ^= from_bit | to_bit
+            self.white &= ~captured
+            own_pawn_keys, own_queen_keys = BROWN_PAWN_KEYS, BROWN_QUEEN_KEYS
+            opp_pawn_keys, opp_queen_keys = WHITE_PAWN_KEYS, WHITE_QUEEN_KEYS
+            own_pawn_values, own_queen_values = BROWN_PAWN_VALUES, BROWN_QUEEN_VALUES
+            opp_pawn_values, opp_queen_values = WHITE_PAWN_VALUES, WHITE_QUEEN_VALUES
+
+        promoted = False
+        if self.queens & from_bit:
+            self.queens ^= from_bit | to_bit
+            key ^= own_queen_keys[frm] ^ own_queen_keys[to]
+            removed, added = own_queen_values[frm], own_queen_values[to]
+        elif to_bit & PROMOTION_SQUARES:
+            self.queens |= to_bit
+            promoted = True
+            key ^= own_pawn_keys[frm] ^ own_queen_keys[to]
+            removed, added = own_pawn_values[frm], own_queen_values[to]
+        else:
+            key ^= own_pawn_keys[frm] ^ own_pawn_keys[to]
+            removed, added = own_pawn_values[frm], own_pawn_values[to]
+
+        previous_values = self.values
+        opening, middlegame, endgame = previous_values
+        opening += added[0] - removed[0]
+        middlegame += added[1] - removed[1]
+        endgame += added[2] - removed[2]
+
+        if captured:
+            for sq in bits(captured):
+                if captured_queens & (1 << sq):
+                    key ^= opp_queen_keys[sq]
+                    removed = opp_queen_values[sq]
+                else:
+                    key ^= opp_pawn_keys[sq]
+                    removed = opp_pawn_values[sq]
+                opening -= removed[0]
+                middlegame -= removed[1]
+                endgame -= removed[2]
+            self.queens &= ~captured
+
+        self.zobrist_key = key
+        self.values = (opening, middlegame, endgame)
+        self.turn = BROWN if self.turn == WHITE else WHITE
+        if self.debug:
+            self.check_zobrist_key()
+            self.check_values()
+
+        return frm, to, captured, captured_queens, promoted, previous_key, previous_values
+
+    def undo_move(self, undo):
+        """
+        Funkcija ponistava potez odigran sa `apply_move`.
+        - `undo`: zapis koji je vratila funkcija `apply_move`
+        """
+        frm, to, captured, captured_queens, promoted, zobrist_key, values = undo
+        from_bit = 1 << frm
+        to_bit = 1 << to
+        if self.white & to_bit:
+            self.white ^= from_bit | to_bit
+            self.brown |= captured
+        else:
+            self.brown ^= from_bit | to_bit
+            self.white |= captured
+
+        if promoted:
+            self.queens ^= to_bit
+        elif self.queens & to_bit:
+            self.queens ^= from_bit | to_bit
+        self.queens |= captured_queens
+        self.zobrist_key = zobrist_key
+        self.values = values
+        self.turn = BROWN if self.turn == WHITE else WHITE
+        if self.debug:
+            self.check_zobrist_key()
+            self.check_values()
+
+    def get_sides(self, color):
+        """
+        Funkcija vraca figure igraca, figure protivnika i prazna polja.
+        """
+        if color == WHITE:
+            return self.white, self.brown, FULL ^ (self.white | self.brown)
+        return self.brown, self.white, FULL ^ (self.white | self.brown)
+
+    def get_movers(self, color):
+        """
+        Funkcija vraca figure koje mogu da idu nagore i figure koje mogu da idu nadole.
+        """
+        if color == WHITE:
+            return self.white & self.queens, self.white
+        return self.brown, self.brown & self.queens
+
+    def get_jumpers(self, color):
+        """
+        Funkcija vraca masku figura zadate boje koje mogu da pojedu bar jednu protivnicku figuru.
+        Racuna se za sve figure odjednom pomeranjem maski.
+        """
+        own, opp, empty = self.get_sides(color)
+        up, down = self.get_movers(color)
+        jumpers = 0
+        for direction in UP_DIRECTIONS:
+            if up:
+                back = OPPOSITE[direction]
+                jumpers |= shift(shift(empty, back) & opp, back) & up
+        for direction in DOWN_DIRECTIONS:
+            if down:
+                back = OPPOSITE[direction]
+                jumpers |= shift(shift(empty, back) & opp, back) & down
+        return jumpers
+
+    def get_valid_moves(self, sq):
+        """
+        Funkcija vraca sve moguce poteze za figuru na zadatom polju, kao recnik
+        `{ciljno polje: maska pojedenih figura}`.
+        - `sq`: polje na kome se figura nalazi
+        """
+        bit = 1 << sq
+        if self.white & bit:
+            color, opp = WHITE, self.brown
+        else:
+            color, opp = BROWN, self.white
+        empty = FULL ^ (self.white | self.brown)
+        queen = self.queens & bit
+        moves = {}
+        if color == BROWN or queen:
+            moves.update(self.get_moves(sq, UP_LEFT, UP_DIRECTIONS, opp, empty, 0))
+            moves.update(self.get_moves(sq, UP_RIGHT, UP_DIRECTIONS, opp, empty, 0))
+        if color == WHITE or queen:
+            moves.update(self.get_moves(sq, DOWN_LEFT, DOWN_DIRECTIONS, opp, empty, 0))
+            moves.update(self.get_moves(sq, DOWN_RIGHT, DOWN_DIRECTIONS, opp, empty, 0))
+        return moves
+
+    def get_moves(self, sq, direction, directions, opp, empty, captured):
+        """
+        Funkcija dobavlja poteze u datom pravcu od zadatog polja, kao `Board.get_moves`.
+        - `sq`: polje od kojeg se krece
+        - `direction`: smer kretanja
+        - `directions`: oba smera iste vertikalne orijentacije, za nastavak skakanja
+        - `opp`: maska protivnickih figura
+        - `empty`: maska praznih polja
+        - `captured`: maska figure pojedene u prethodnom skoku
+        """
+        moves = {}
+        first = NEIGHBOR[direction][sq]
+        if first < 0:
+            return moves
+        first_bit = 1 << first
+        if empty & first_bit:
+            if not captured:
+                moves[first] = 0
+            return moves
+        if not opp & first_bit:
+            return moves
+        landing = NEIGHBOR[direction][first]
+        if landing < 0 or not empty & (1 << landing):
+            return moves
+        moves[landing] = first_bit | captured
+        moves.update(self.get_moves(landing, directions[0], directions, opp, empty, first_bit))
+        moves.update(self.get_moves(landing, directions[1], directions, opp, empty, first_bit))
+        return moves
+
+    def generate_moves(self, color, mode):
+        """
+        Funkcija vraca listu svih poteza `(sa, na, maska pojedenih figura)` za zadatu boju.
+        Potezi su poredjani po polaznom polju (redom kao u `bits`), a potezi iste figure po smeru
+        (gore levo, gore desno, dole levo, dole desno), kao u generatoru poteza grafickog interfejsa.
+        - `color`: boja igraca koji je na potezu
+        - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+        """
+        empty = FULL ^ (self.white | self.brown)
+        jumpers = self.get_jumpers(color)
+        moves = []
+        if mode == 1 and jumpers:
+            for sq in bits(jumpers):
+                for target, captured in self.get_valid_moves(sq).items():
+                    if captured:
+                        moves.append((sq, target, captured))
+            return moves
+
+        up, down = self.get_movers(color)
+        origins = []
+        for direction in range(4):
+            movers = up if direction < DOWN_LEFT else down
+            origins.append(shift(shift(movers, direction) & empty, OPPOSITE[direction]))
+        up_left, up_right, down_left, down_right = origins
+
+        for sq in bits(jumpers | up_left | up_right | down_left | down_right):
+            bit = 1 << sq
+            if jumpers & bit:
+                for target, captured in self.get_valid_moves(sq).items():
+                    moves.append((sq, target, captured))
+                continue
+            if up_left & bit:
+                moves.append((sq, NEIGHBOR[UP_LEFT][sq], 0))
+            if up_right & bit:
+                moves.append((sq, NEIGHBOR[UP_RIGHT][sq], 0))
+            if down_left & bit:
+                moves.append((sq, NEIGHBOR[DOWN_LEFT][sq], 0))
+            if down_right & bit:
+                moves.append((sq, NEIGHBOR[DOWN_RIGHT][sq], 0))
+        return moves
+
+    def has_valid_moves_for_color(self, color):
+        """
+        Funkcija koja vraca True ako postoji makar jedan potez za neku figuru zadate boje.
+        """
+        empty = FULL ^ (self.white | self.brown)
+        up, down = self.get_movers(color)
+        for direction in UP_DIRECTIONS:
+            if shift(up, direction) & empty:
+                return True
+        for direction in DOWN_DIRECTIONS:
+            if shift(down, direction) & empty:
+                return True
+        return bool(self.get_jumpers(color))
+
+    def game_over(self, turn):
+        """
+        Funkcija koja proverava da li je igra zavrsena.
+        """
+        if self.brown_left <= 0:
+            return "WHITE"
+        elif self.white_left <= 0:
+            return "BROWN"
+        if not self.has_valid_moves_for_color(turn):
+            if turn == WHITE:
+                return "BROWN"
+            else:
+                return "WHITE"
+        return None
+
+    def get_terminal_score(self, maximizing_player, moves):
+        """
+        Funkcija vraca skor zavrsnog stanja ili None ako igra nije zavrsena.
+        - `maximizing_player`: True ako je beli na potezu
+        - `moves`: potezi igraca koji je na potezu (u bilo kom rezimu)
+        """
+        if not self.brown:
+            return 100000
+        if not self.white:
+            return -100000
+        if not moves:
+            return -100000 if maximizing_player else 100000
+        return None
+
+    def evaluate_state(self, maximizing_player):
+        """
+        Heuristicka funkcija, ista kao `Board.evaluate_state`.
+        Deo skora koji zavisi samo od polja figura se cita iz `values`; od poteza obe boje,
+        koji se generisu jednom, racunaju se kraj igre, mobilnost i promocija u jednom potezu.
+        Skor je isti kao `evaluation_based_on_phase` do na gresku zaokruzivanja.
+        """
+        white_moves = self.generate_moves(WHITE, 0)
+        brown_moves = self.generate_moves(BROWN, 0)
+        terminal = self.get_terminal_score(maximizing_player, white_moves if maximizing_player else brown_moves)
+        if terminal is not None:
+            return terminal
+
+        phase = get_phase((self.white | self.brown).bit_count())
+        mobility_pawn, mobility_queen, promotion_bonus = PHASE_MOVE_WEIGHTS[phase]
+        queens = self.queens
+        value = self.values[phase]
+        promotable = 0
+        for frm, to, _ in white_moves:
+            if queens >> frm & 1:
+                value += mobility_queen
+            else:
+                value += mobility_pawn
+                if (1 << to) & PROMOTION_SQUARES:
+                    promotable |= 1 << frm
+        value += promotion_bonus * promotable.bit_count()
+        promotable = 0
+        for frm, to, _ in brown_moves:
+            if queens >> frm & 1:
+                value -= mobility_queen
+            else:
+                value -= mobility_pawn
+                if (1 << to) & PROMOTION_SQUARES:
+                    promotable |= 1 << frm
+        value -= promotion_bonus * promotable.bit_count()
+        return value / EVAL_SCALE
+
+    def evaluate_state_full(self, maximizing_player):
+        """
+        Heuristicka funkcija racunata prolaskom kroz sve figure, kao u `Board.evaluate_state`.
+        Sluzi za proveru `evaluate_state`.
+        """
+        white_moves = self.generate_moves(WHITE, 0)
+        brown_moves = self.generate_moves(BROWN, 0)
+        terminal = self.get_terminal_score(maximizing_player, white_moves if maximizing_player else brown_moves)
+        if terminal is not None:
+            return terminal
+        weights = PHASE_WEIGHTS[get_phase(self.brown_left + self.white_left)]
+        return self.evaluation_based_on_phase(white_moves + brown_moves, *weights)
+
+    def evaluation_based_on_phase(self, moves, pawn_weight, queen_weight, safe_pawn, safe_queen,
+                                mobility_pawn, mobility_queen, promotion_bonus,
+                                defending_pieces, attacking_piece, center_piece):
+        """
+        - `moves`: svi potezi obe boje, bez obaveznog jedenja
+        """
+        mobility = [0] * SQUARES
+        promotable = 0
+        for frm, to, _ in moves:
+            mobility[frm] += 1
+            if (1 << to) & PROMOTION_SQUARES:
+                promotable |= 1 << frm
+
+        white_value = 0
+        brown_value = 0
+
+        for sq in bits(self.white | self.brown):
+            row, col = row_col(sq)
+            bit = 1 << sq
+            color = WHITE if self.white & bit else BROWN
+            queen = self.queens & bit
+
+            piece_value = 0
+
+            if queen:
+                piece_value += queen_weight
+            else:
+                piece_value += pawn_weight
+
+            if (row == 0 and color == WHITE) or (row == ROWS - 1 and color == BROWN) or col == 0 or col == COLS - 1:
+                if queen:
+                    piece_value += safe_queen
+                else:
+                    piece_value += safe_pawn
+
+            piece_value += mobility[sq] * (mobility_queen if queen else mobility_pawn)
+
+            if not queen:
+                piece_value += promotion_bonus * (1 / self.distance_to_promotion(row, color))
+                if promotable & bit:
+                    piece_value += 2 * promotion_bonus
+
+            if (row <= 1 and color == WHITE) or (row >= ROWS - 2 and color == BROWN):
+                piece_value += defending_pieces
+
+            if row == 0 and color == WHITE and (col == 1 or col == 5):
+                piece_value += 2 * defending_pieces
+            elif row == ROWS - 1 and color == BROWN and (col == 2 or col == 6):
+                piece_value += 2 * defending_pieces
+
+            if 2 <= row <= 5 and 2 <= col <= 5:
+                piece_value += center_piece
+            elif color == WHITE and row >= ROWS - 3:
+                piece_value += attacking_piece
+            elif color == BROWN and row <= 2:
+                piece_value += attacking_piece
+
+            if color == BROWN:
+                brown_value += piece_value
+            else:
+                white_value += piece_value
+
+        return white_value - brown_value
+
+    def distance_to_promotion(self, row, color):
+        if color == WHITE:
+            return ROWS - 1 - row
+        return row
@@ -0,0 +1,208 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .bitboard import BitBoard, move_to_string
+from .constants import WHITE, BROWN
+from .search import Search
+
+# kljuc (bele, braon, kraljice, igrac na potezu i rezim) + potez (sa, na) + skor za belog, ukupno 19 bajtova
+ENTRY = struct.Struct('>IIIBBBf')
+KEY_SIZE = 13
+
+def reverse_bits(mask):
+    """
+    Funkcija obrce redosled 32 bita, tj. okrece tablu za 180 stepeni (polje `i` postaje `31 - i`).
+    """
+    return int(f"{mask:032b}"[::-1], 2)
+
+def mirror(white, brown, queens, turn):
+    """
+    Funkcija vraca poziciju okrenutu za 180 stepeni sa zamenjenim bojama.
+    Beli u okrenutoj poziciji igra isto kao braon u polaznoj, pa je skor suprotan.
+    """
+    return reverse_bits(brown), reverse_bits(white), reverse_bits(queens), WHITE if turn == BROWN else BROWN
+
+def mirror_move(move):
+    frm, to, captured = move
+    return 31 - frm, 31 - to, reverse_bits(captured)
+
+def position_key(white, brown, queens, turn, mode):
+    return struct.pack('>IIIB', white, brown, queens, (turn == WHITE) | mode << 1)
+
+def canonical_key(board, mode):
+    """
+    Funkcija vraca `(kljuc, da li je pozicija okrenuta)`. Pozicija i njena okrenuta pozicija
+    sa zamenjenim bojama imaju isti kljuc, pa se cuvaju kao jedan unos.
+    U otvaranju se takve pozicije retko sretnu: do 8 poteza spajanje smanjuje broj pozicija
+    za samo 0.4% sa obaveznim jedenjem (42071 -> 41896) i 1.8% bez njega (104832 -> 102986).
+    """
+    key = position_key(board.white, board.brown, board.queens, board.turn, mode)
+    mirrored = position_key(*mirror(board.white, board.brown, board.queens, board.turn), mode)
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+
+class OpeningBook(object):
+    """
+    Knjiga otvaranja u sortiranom binarnom fajlu, koja se mapira u memoriju (mmap) i pretrazuje binarnom pretragom.
+    Vise procesa koji koriste isti fajl dele iste stranice u memoriji.
+    - `path`: putanja do fajla koji je napravio `write_book`
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b''
+        self.entries = len(self.memory) // ENTRY.size
+
+    def close(self):
+        if self.entries:
+            self.memory.close()
+
+    def __len__(self):
+        return self.entries
+
+    def find(self, key):
+        """
+        Funkcija vraca `(sa, na, skor)` za zadati kljuc ili None.
+        """
+        memory = self.memory
+        low, high = 0, self.entries
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * ENTRY.size
+            middle_key = memory[offset:offset + KEY_SIZE]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return ENTRY.unpack_from(memory, offset)[4:]
+        return None
+
+    def probe(self, board, mode):
+        """
+        Funkcija vraca `(potez, skor)` iz knjige za zadatu poziciju ili None.
+        - `board`: pozicija kao `BitBoard`
+        - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+        """
+        key, mirrored = canonical_key(board, mode)
+        entry = self.find(key)
+        if entry is None:
+            return None
+        frm, to, score = entry
+        if mirrored:
+            frm, to, score = 31 - frm, 31 - to, -score
+        for move in board.generate_moves(board.turn, mode):
+            if move[0] == frm and move[1] == to:
+                return move, score
+        return None
+
+def write_book(path, entries):
+    """
+    Funkcija upisuje unose `{kljuc: (potez, skor)}` u fajl, sortirane po kljucu.
+    """
+    with open(path, 'wb') as f:
+        for key in sorted(entries):
+            move, score = entries[key]
+            f.write(key + ENTRY.pack(0, 0, 0, 0, move[0], move[1], score)[KEY_SIZE:])
+
+def book_positions(plies, mode):
+    """
+    Funkcija vraca sve pozicije do kojih se stize za manje od `plies` poteza od pocetne pozicije,
+    kao recnik `{kanonski kljuc: upakovana pozicija}` (vidi `BitBoard.pack`).
+    """
+    positions = {}
+    frontier = [BitBoard(turn=BROWN)]
+    for _ in range(plies):
+        next_frontier = []
+        for board in frontier:
+            key, _ = canonical_key(board, mode)
+            if key in positions:
+                continue
+            positions[key] = board.pack()
+            for move in board.generate_moves(board.turn, mode):
+                child = BitBoard(board.white, board.brown, board.queens, board.turn)
+                child.apply_move(move)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+def search_book_position(key, packed, mode, depth, time_limit):
+    """
+    Funkcija koja se izvrsava u procesu radniku: pretrazuje jednu poziciju knjige.
+    Vraca `(kljuc, potez, skor)` u kanonskom obliku, ili None ako pozicija nema poteza.
+    """
+    board = BitBoard.from_packed(packed)
+    search = Search(time_limit=time_limit)
+    move = search.run(board, depth, mode)
+    if move is None or not search.iterations:
+        return None
+    score = search.iterations[-1][1]
+    if canonical_key(board, mode)[1]:
+        move, score = mirror_move(move), -score
+    return key, move, score
+
+def build_book(path, plies=6, depth=11, modes=(1, 0), time_limit=float('inf'), workers=None):
+    """
+    Funkcija pretrazuje sve pozicije prvih `plies` poteza do dubine `depth` u grupi procesa
+    i upisuje najbolje poteze u knjigu. Vraca broj unosa.
+    """
+    entries = {}
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as executor:
+        for mode in modes:
+            positions = book_positions(plies, mode)
+            futures = [executor.submit(search_book_position, key, packed, mode, depth, time_limit)
+                       for key, packed in positions.items()]
+            for future in futures:
+                result = future.result()
+                if result is not None:
+                    key, move, score = result
+                    entries[key] = (move, score)
+    write_book(path, entries)
+    return len(entries)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.book', description='Knjiga otvaranja.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='pretrazi pozicije otvaranja i upisi knjigu')
+    build.add_argument('output', help='fajl knjige')
+    build.add_argument('--plies', type=int, default=6, help='broj poteza od pocetne pozicije koje knjiga pokriva')
+    build.add_argument('--depth', type=int, default=11, help='dubina pretrage svake pozicije')
+    build.add_argument('--modes', type=int, nargs='+', choices=(0, 1), default=[1, 0], help='rezimi igre')
+    build.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='broj procesa')
+    show = commands.add_parser('probe', help='potezi iz knjige za pocetnu poziciju i pozicije posle prvog poteza')
+    show.add_argument('book', help='fajl knjige')
+    show.add_argument('--mode', type=int, choices=(0, 1), default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start_time = time.time()
+        count = build_book(args.output, args.plies, args.depth, args.modes, workers=args.workers)
+        print(f"{count} unosa, {time.time() - start_time:.1f} s")
+        return
+
+    book = OpeningBook(args.book)
+    start = BitBoard(turn=BROWN)
+    positions = [start]
+    for move in start.generate_moves(BROWN, args.mode):
+        board = BitBoard(start.white, start.brown, start.queens, start.turn)
+        board.apply_move(move)
+        positions.append(board)
+    print(f"{len(book)} unosa")
+    for board in positions:
+        start_time = time.perf_counter()
+        entry = book.probe(board, args.mode)
+        elapsed = time.perf_counter() - start_time
+        if entry is None:
+            print(f"nema u knjizi ({elapsed * 1e6:.0f} us)")
+        else:
+            move, score = entry
+            print(f"{move_to_string(move):30} {score:10.2f} ({elapsed * 1e6:.0f} us)")
+    book.close()
+
+if __name__ == '__main__':
+    main()
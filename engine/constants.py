@@ -0,0 +1,5 @@
+ROWS, COLS = 8, 8
+
+# RGB
+WHITE = (255, 255, 255)
+BROWN = (159, 129, 112)
@@ -0,0 +1,52 @@
+import argparse
+import time
+from .bitboard import move_to_string
+from .positions import POSITIONS
+from .search import Search
+from .transposition import TranspositionTable
+
+# nivoi tezine kao ogranicenja dubine i broja cvorova; pretraga ne zavisi od vremena ni od opterecenja racunara,
+# pa ista pozicija na istom nivou uvek daje isti potez i isti broj cvorova
+LEVELS = {
+    "pocetnik": {"depth": 2, "node_limit": 200, "table_mb": 1},
+    "lako": {"depth": 4, "node_limit": 2000, "table_mb": 1},
+    "srednje": {"depth": 6, "node_limit": 10000, "table_mb": 4},
+    "tesko": {"depth": 10, "node_limit": 50000, "table_mb": 16},
+    "majstor": {"depth": 64, "node_limit": 250000, "table_mb": 16},
+}
+
+def level_search(name, **options):
+    """
+    Funkcija vraca `(pretraga, najveca dubina)` za zadati nivo tezine.
+    - `name`: ime nivoa iz `LEVELS`
+    - `options`: ostali argumenti konstruktora `Search` (npr. `book`, `tablebase`)
+    """
+    if name not in LEVELS:
+        raise ValueError(f"Nepoznat nivo tezine: {name} (moguci: {', '.join(LEVELS)})")
+    level = LEVELS[name]
+    search = Search(TranspositionTable(level["table_mb"]), float('inf'), node_limit=level["node_limit"],
+                    deterministic=True, **options)
+    return search, level["depth"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.levels', description='Potezi i broj cvorova za svaki nivo tezine.')
+    parser.add_argument('--position', choices=sorted(POSITIONS), default='pocetna', help='pozicija iz engine.positions')
+    parser.add_argument('--mode', type=int, choices=(0, 1), default=1, help='1 ako je jedenje obavezno, 0 ako nije')
+    parser.add_argument('--repeat', type=int, default=2, help='broj ponavljanja pretrage za proveru ponovljivosti')
+    args = parser.parse_args(argv)
+
+    board = POSITIONS[args.position]
+    for name in LEVELS:
+        results = set()
+        for _ in range(args.repeat):
+            search, depth = level_search(name)
+            start_time = time.time()
+            move = search.run(board, depth, args.mode)
+            elapsed = time.time() - start_time
+            results.add((move, search.nodes))
+        depth_reached = search.iterations[-1][0] if search.iterations else 0
+        print(f"{name:10} {move_to_string(move) if move else '-':30} depth {depth_reached:2}, {search.nodes:7} nodes, "
+              f"{elapsed:.3f} s{'' if len(results) == 1 else '   NOT REPRODUCIBLE'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import ast
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .constants import WHITE, BROWN
+from .levels import level_search
+from .search import Search
+from .selfplay import play_game
+from .timecontrol import TimeControl
+from .transposition import TranspositionTable
+
+def parse_config(text):
+    """
+    Funkcija pretvara opis podesavanja motora oblika "depth=7,time_limit=0.5,table_mb=16" u recnik.
+    Vrednosti se citaju kao Python literali, a ostale kao tekst.
+    """
+    config = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        key, value = item.split('=', 1)
+        try:
+            config[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            config[key.strip()] = value.strip()
+    return config
+
+def make_search(config):
+    """
+    Funkcija pravi pretragu prema podesavanjima i vraca `(pretraga, najveca dubina)`.
+    - `depth`: najveca dubina pretrage (podrazumevano 7)
+    - `table_mb`: velicina transpozicione tabele u megabajtima
+    - `clock`, `increment`: sat partije u sekundama (`timecontrol.TimeControl`) umesto vremena po potezu
+    - `level`: nivo tezine iz `levels.LEVELS`; tada se ostali kljucevi ne koriste
+    - ostali kljucevi se prosledjuju konstruktoru `Search`
+    """
+    if 'level' in config:
+        return level_search(config['level'])
+    options = dict(config)
+    depth = options.pop('depth', 7)
+    table_mb = options.pop('table_mb', None)
+    table = TranspositionTable(table_mb) if table_mb else None
+    clock = options.pop('clock', None)
+    increment = options.pop('increment', 0.0)
+    if clock is not None:
+        options['time_control'] = TimeControl(clock, increment)
+    return Search(table, **options), depth
+
+def play_match_game(game_id, config_a, config_b, mode, opening_plies, seed, max_plies):
+    """
+    Funkcija koja se izvrsava u procesu radniku: igra jednu partiju izmedju dva podesavanja.
+    Parne partije prvo podesavanje igra belim, neparne braon figurama, sa istim otvaranjem za oba para.
+    Vraca recnik partije iz `play_game` dopunjen sa `score`, rezultatom za prvo podesavanje (1, 0.5 ili 0).
+    """
+    search_a, depth_a = make_search(config_a)
+    search_b, depth_b = make_search(config_b)
+    a_color = WHITE if game_id % 2 == 0 else BROWN
+    if a_color == WHITE:
+        game = play_game(game_id, mode, opening_plies=opening_plies, seed=seed, max_plies=max_plies,
+                         white_search=search_a, brown_search=search_b, white_depth=depth_a, brown_depth=depth_b,
+                         opening_id=game_id // 2)
+    else:
+        game = play_game(game_id, mode, opening_plies=opening_plies, seed=seed, max_plies=max_plies,
+                         white_search=search_b, brown_search=search_a, white_depth=depth_b, brown_depth=depth_a,
+                         opening_id=game_id // 2)
+    game["a_color"] = "WHITE" if a_color == WHITE else "BROWN"
+    if game["result"] == "DRAW":
+        game["score"] = 0.5
+    else:
+        game["score"] = 1.0 if game["result"] == game["a_color"] else 0.0
+    return game
+
+def expected_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def elo_from_score(score):
+    return -400 * math.log10(1 / score - 1)
+
+def score_statistics(wins, draws, losses):
+    """
+    Funkcija vraca `(broj partija, srednji rezultat, varijansa rezultata jedne partije)`.
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0, 0.5, 0.0
+    mean = (wins + draws / 2) / games
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games
+    return games, mean, variance
+
+def elo_estimate(wins, draws, losses):
+    """
+    Funkcija vraca `(elo, granica greske)` prvog podesavanja u odnosu na drugo, sa intervalom poverenja od 95%.
+    Ako jedno podesavanje nije izgubilo nijednu partiju, razlika je beskonacna.
+    """
+    games, mean, variance = score_statistics(wins, draws, losses)
+    if games == 0:
+        return 0.0, float('inf')
+    if mean <= 0 or mean >= 1:
+        return (float('inf') if mean >= 1 else float('-inf')), float('inf')
+    error = 1.96 * math.sqrt(variance / games)
+    low = elo_from_score(mean - error) if mean - error > 0 else float('-inf')
+    high = elo_from_score(mean + error) if mean + error < 1 else float('inf')
+    return elo_from_score(mean), (high - low) / 2
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Funkcija vraca log odnos verodostojnosti (LLR) hipoteza H1 (razlika je `elo1`) i H0 (razlika je `elo0`),
+    koristeci normalnu aproksimaciju rezultata partija.
+    """
+    games, mean, variance = score_statistics(wins, draws, losses)
+    if games == 0 or variance == 0:
+        return 0.0
+    score0 = expected_score(elo0)
+    score1 = expected_score(elo1)
+    return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+def sprt_bounds(alpha, beta):
+    """
+    Funkcija vraca donju i gornju granicu LLR: ispod donje se prihvata H0, iznad gornje H1.
+    - `alpha`: verovatnoca da se prihvati H1 kada vazi H0
+    - `beta`: verovatnoca da se prihvati H0 kada vazi H1
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+class Match(object):
+    """
+    Mec izmedju dva podesavanja motora u paralelnim partijama sa zamenom boja.
+    Mec se prekida ranije kada SPRT prihvati jednu od hipoteza.
+    - `config_a`, `config_b`: podesavanja motora (vidi `make_search`)
+    - `games`: najveci broj partija
+    - `workers`: broj procesa; podrazumevano broj jezgara
+    - `modes`: rezimi igre koji se smenjuju po parovima partija
+    - `elo0`, `elo1`, `alpha`, `beta`: parametri SPRT
+    """
+    def __init__(self, config_a, config_b, games=1000, workers=None, modes=(1, 0), opening_plies=4, seed=0,
+                 max_plies=200, elo0=0, elo1=10, alpha=0.05, beta=0.05):
+        self.config_a = config_a
+        self.config_b = config_b
+        self.games = games
+        self.workers = workers or os.cpu_count() or 1
+        self.modes = modes
+        self.opening_plies = opening_plies
+        self.seed = seed
+        self.max_plies = max_plies
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower, self.upper = sprt_bounds(alpha, beta)
+        self.wins = self.draws = self.losses = 0
+        self.llr = 0.0
+
+    def decision(self):
+        """
+        Funkcija vraca "H1" ako je prvo podesavanje prihvaceno kao jace, "H0" ako je odbijeno, inace None.
+        """
+        if self.llr >= self.upper:
+            return "H1"
+        if self.llr <= self.lower:
+            return "H0"
+        return None
+
+    def run(self):
+        """
+        Generator koji vraca partije redom kojim se zavrse, dok SPRT ne donese odluku ili se ne odigraju sve partije.
+        """
+        executor = ProcessPoolExecutor(self.workers)
+        try:
+            futures = [executor.submit(play_match_game, game_id, self.config_a, self.config_b,
+                                       self.modes[game_id // 2 % len(self.modes)], self.opening_plies,
+                                       self.seed, self.max_plies)
+                       for game_id in range(self.games)]
+            for future in as_completed(futures):
+                game = future.result()
+                if game["score"] == 1:
+                    self.wins += 1
+                elif game["score"] == 0:
+                    self.losses += 1
+                else:
+                    self.draws += 1
+                self.llr = sprt_llr(self.wins, self.draws, self.losses, self.elo0, self.elo1)
+                yield game
+                if self.decision() is not None:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.match', description='Mec dva podesavanja motora sa SPRT zaustavljanjem.')
+    parser.add_argument('--a', required=True, help='prvo podesavanje, npr. "depth=7,time_limit=0.5"')
+    parser.add_argument('--b', required=True, help='drugo podesavanje, npr. "depth=6,time_limit=0.5"')
+    parser.add_argument('--games', type=int, default=1000, help='najveci broj partija')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='broj procesa')
+    parser.add_argument('--modes', type=int, nargs='+', choices=(0, 1), default=[1, 0], help='rezimi igre koji se smenjuju')
+    parser.add_argument('--opening-plies', type=int, default=4, help='broj nasumicnih poteza na pocetku partije')
+    parser.add_argument('--seed', type=int, default=0, help='seme za nasumicna otvaranja')
+    parser.add_argument('--max-plies', type=int, default=200, help='broj poteza posle kojeg je partija nereseno')
+    parser.add_argument('--elo0', type=float, default=0, help='razlika za hipotezu H0')
+    parser.add_argument('--elo1', type=float, default=10, help='razlika za hipotezu H1')
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--output', help='fajl u koji se upisuju partije kao JSON linije')
+    args = parser.parse_args(argv)
+
+    match = Match(parse_config(args.a), parse_config(args.b), args.games, args.workers, args.modes, args.opening_plies,
+                  args.seed, args.max_plies, args.elo0, args.elo1, args.alpha, args.beta)
+    output = open(args.output, 'a') if args.output else None
+    try:
+        for game in match.run():
+            if output is not None:
+                output.write(json.dumps(game) + "\n")
+            elo, error = elo_estimate(match.wins, match.draws, match.losses)
+            print(f"{match.wins + match.draws + match.losses:5} partija  +{match.wins} ={match.draws} -{match.losses}"
+                  f"  Elo {elo:+.1f} +/- {error:.1f}  LLR {match.llr:.2f} [{match.lower:.2f}, {match.upper:.2f}]")
+    finally:
+        if output is not None:
+            output.close()
+
+    decision = match.decision()
+    if decision == "H1":
+        print("H1 prihvacena: prvo podesavanje je jace")
+    elif decision == "H0":
+        print("H0 prihvacena: prvo podesavanje nije jace")
+    else:
+        print("Nema odluke")
+    sys.exit(0 if decision == "H1" else 1)
+
+if __name__ == '__main__':
+    main()
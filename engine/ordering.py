@@ -0,0 +1,57 @@
+from array import array
+from .constants import WHITE
+from .transposition import NO_MOVE
+
+MAX_PLY = 64
+
+
+class MoveOrdering(object):
+    """
+    Redosled pretrage poteza: prvo potez iz transpozicione tabele, zatim jedenja
+    (vise pojedenih figura ranije), pa dva killer poteza za dati nivo i na kraju
+    tihi potezi sortirani po history tabeli.
+    Objekat traje tokom cele pretrage, pa se history cuva izmedju iteracija.
+    """
+    def __init__(self):
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(MAX_PLY)]
+        self.history = (array('l', [0]) * 1024, array('l', [0]) * 1024)
+
+    def order(self, moves, hash_code, ply, color):
+        """
+        Funkcija vraca poteze u redosledu u kojem ih treba pretraziti.
+        - `moves`: lista poteza `(sa, na, maska pojedenih figura)`
+        - `hash_code`: kod najboljeg poteza iz transpozicione tabele
+        - `ply`: udaljenost cvora od korena
+        - `color`: boja igraca koji je na potezu
+        """
+        if len(moves) < 2:
+            return moves
+        first_killer, second_killer = self.killers[ply]
+        history = self.history[0 if color == WHITE else 1]
+
+        def priority(move):
+            code = move[0] << 5 | move[1]
+            if code == hash_code:
+                return 4, 0
+            if move[2]:
+                return 3, move[2].bit_count()
+            if code == first_killer:
+                return 2, 1
+            if code == second_killer:
+                return 2, 0
+            return 1, history[code]
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def update(self, move, ply, depth, color):
+        """
+        Funkcija pamti tihi potez koji je doveo do odsecanja kao killer potez i povecava njegovu history vrednost.
+        """
+        if move[2]:
+            return
+        code = move[0] << 5 | move[1]
+        killers = self.killers[ply]
+        if killers[0] != code:
+            killers[1] = killers[0]
+            killers[0] = code
+        self.history[0 if color == WHITE else 1][code] += depth * depth
@@ -0,0 +1,280 @@
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from .bitboard import BitBoard, move_to_string
+from .constants import WHITE
+from .ordering import MoveOrdering
+from .positions import POSITIONS
+from .search import Search
+from .transposition import NO_MOVE, SharedTranspositionTable, attach_shared_memory
+
+SPEEDUP_POSITIONS = [
+    ("pocetna", POSITIONS["pocetna"], 1),
+    ("sredina", POSITIONS["sredina"], 1),
+    ("sredina bez obaveznog jedenja", POSITIONS["sredina bez obaveznog jedenja"], 0),
+    ("kraljice", POSITIONS["kraljice"], 1),
+]
+
+worker_search = None
+shared_search = None
+shared_stop = None
+
+def search_root_moves(packed, max_depth, mode, time_limit, root_moves):
+    """
+    Funkcija koja se izvrsava u procesu radniku: pretrazuje samo zadate poteze iz korena
+    pozicije zadate u upakovanom obliku (`BitBoard.pack`).
+    Pretraga (i njena transpoziciona tabela) se cuva u procesu izmedju poziva.
+    Vraca zavrsene iteracije i broj posecenih cvorova.
+    """
+    global worker_search
+    if worker_search is None:
+        worker_search = Search()
+    worker_search.time_limit = time_limit
+    worker_search.run(BitBoard.from_packed(packed), max_depth, mode, root_moves=root_moves)
+    return worker_search.iterations, worker_search.nodes
+
+
+class ParallelSearch(object):
+    """
+    Paralelna pretraga u korenu: potezi iz korena se dele na procese radnike,
+    svaki radnik ih pretrazuje iterativnim produbljivanjem, a bira se najbolji potez
+    sa najvece dubine koju su zavrsili svi radnici.
+    - `workers`: broj procesa; podrazumevano broj jezgara
+    - `time_limit`: vreme u sekundama posle kojeg se pretraga prekida
+    """
+    def __init__(self, workers=None, time_limit=2.8):
+        self.workers = workers or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.executor = None
+        self.depth = 0
+        self.nodes = 0
+
+    def start(self):
+        """
+        Funkcija pokrece procese radnike, da se vreme pokretanja ne racuna u prvu pretragu.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def run(self, board, max_depth, mode):
+        """
+        Funkcija vraca najbolji potez `(sa, na, maska pojedenih figura)`, isto kao `Search.run`.
+        - `board`: pozicija kao `BitBoard`
+        - `max_depth`: najveca dubina pretrage
+        - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+        """
+        self.depth = 0
+        self.nodes = 0
+        moves = board.generate_moves(board.turn, mode)
+        if len(moves) < 2:
+            return moves[0] if moves else None
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+
+        moves = MoveOrdering().order(moves, NO_MOVE, 0, board.turn)
+        groups = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+        futures = [self.executor.submit(search_root_moves, board.pack(), max_depth, mode, self.time_limit, group)
+                   for group in groups]
+        results = [future.result() for future in futures]
+
+        self.nodes = sum(nodes for _, nodes in results)
+        self.depth = min(iterations[-1][0] if iterations else 0 for iterations, _ in results)
+        if self.depth == 0:
+            return moves[0]
+
+        best_value = None
+        best_move = moves[0]
+        for iterations, _ in results:
+            for depth, value, move in iterations:
+                if depth != self.depth or move is None:
+                    continue
+                if best_value is None or (value > best_value if board.turn == WHITE else value < best_value):
+                    best_value = value
+                    best_move = move
+        return best_move
+
+
+class SharedFlag(object):
+    """
+    Zastavica u deljenoj memoriji, sa istim `is_set`/`set`/`clear` kao `threading.Event`.
+    Citanje je samo pristup jednom bajtu, pa se moze proveravati u svakom cvoru pretrage.
+    - `name`: ime postojeceg bloka; ako nije zadato, pravi se novi
+    """
+    def __init__(self, name=None):
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=1)
+            self.memory.buf[0] = 0
+        else:
+            self.memory = attach_shared_memory(name)
+        self.name = self.memory.name
+
+    def is_set(self):
+        return self.memory.buf[0] != 0
+
+    def set(self):
+        self.memory.buf[0] = 1
+
+    def clear(self):
+        self.memory.buf[0] = 0
+
+    def close(self):
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def attach_shared(table_name, table_mb, flag_name):
+    """
+    Inicijalizator procesa radnika: povezuje se na deljenu tabelu i zastavicu za zaustavljanje.
+    """
+    global shared_search, shared_stop
+    shared_search = Search(SharedTranspositionTable(table_mb, table_name))
+    shared_stop = SharedFlag(flag_name)
+
+def search_shared(packed, max_depth, mode, time_limit, start_depth):
+    """
+    Funkcija koja se izvrsava u procesu radniku: pretrazuje celu poziciju (upakovanu sa `BitBoard.pack`)
+    koristeci deljenu tabelu.
+    Vraca zavrsene iteracije, broj cvorova i broj pogodaka i upita u tabelu.
+    """
+    table = shared_search.table
+    table.probes = table.hits = 0
+    shared_search.time_limit = time_limit
+    shared_search.run(BitBoard.from_packed(packed), max_depth, mode, shared_stop, start_depth=start_depth)
+    return shared_search.iterations, shared_search.nodes, table.hits, table.probes
+
+
+class LazySMPSearch(object):
+    """
+    Lazy SMP pretraga: svi procesi radnici pretrazuju istu poziciju i dele jednu transpozicionu
+    tabelu u deljenoj memoriji, pa koriste rezultate jedni drugih. Svaki drugi radnik pocinje
+    iterativno produbljivanje jednu dubinu kasnije, da bi se radnici razisli u stablu.
+    Pretraga se zavrsava kada prvi radnik zavrsi najvecu dubinu ili kada istekne vreme.
+    - `workers`: broj procesa; podrazumevano broj jezgara
+    - `time_limit`: vreme u sekundama posle kojeg se pretraga prekida
+    - `table_mb`: velicina deljene tabele u megabajtima
+    """
+    def __init__(self, workers=None, time_limit=2.8, table_mb=16):
+        self.workers = workers or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.table = SharedTranspositionTable(table_mb)
+        self.stop = SharedFlag()
+        self.executor = ProcessPoolExecutor(self.workers, initializer=attach_shared,
+                                            initargs=(self.table.name, table_mb, self.stop.name))
+        self.depth = 0
+        self.nodes = 0
+        self.hits = 0
+        self.probes = 0
+
+    def start(self):
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        self.executor.shutdown()
+        self.table.close()
+        self.stop.close()
+
+    def run(self, board, max_depth, mode):
+        """
+        Funkcija vraca najbolji potez sa najvece dubine koju je zavrsio neki od radnika.
+        """
+        self.stop.clear()
+        futures = [self.executor.submit(search_shared, board.pack(), max_depth, mode, self.time_limit, min(3 + i % 2, max_depth))
+                   for i in range(self.workers)]
+        wait(futures, return_when=FIRST_COMPLETED)
+        self.stop.set()
+        results = [future.result() for future in futures]
+
+        self.nodes = sum(result[1] for result in results)
+        self.hits = sum(result[2] for result in results)
+        self.probes = sum(result[3] for result in results)
+        self.depth = 0
+        best_move = None
+        for iterations, _, _, _ in results:
+            if iterations and iterations[-1][0] > self.depth:
+                self.depth, _, best_move = iterations[-1]
+        if best_move is None:
+            moves = board.generate_moves(board.turn, mode)
+            best_move = moves[0] if moves else None
+        return best_move
+
+def measure_lazy_smp(worker_counts, max_depth, positions=SPEEDUP_POSITIONS):
+    """
+    Funkcija meri vreme do zadate dubine i procenat pogodaka u deljenoj tabeli za razlicit broj radnika.
+    Vraca listu `(broj radnika, ukupno vreme, ukupno cvorova, procenat pogodaka)`.
+    """
+    rows = []
+    for workers in worker_counts:
+        total_time = 0
+        nodes = hits = probes = 0
+        for name, board, mode in positions:
+            search = LazySMPSearch(workers, time_limit=float('inf'))
+            search.start()
+            start_time = time.time()
+            search.run(board, max_depth, mode)
+            total_time += time.time() - start_time
+            nodes += search.nodes
+            hits += search.hits
+            probes += search.probes
+            search.close()
+        rows.append((workers, total_time, nodes, 100 * hits / probes if probes else 0))
+    return rows
+
+def measure_speedup(workers, max_depth, positions=SPEEDUP_POSITIONS):
+    """
+    Funkcija meri ubrzanje paralelne pretrage u odnosu na serijsku, do iste dubine bez vremenskog ogranicenja.
+    Vraca listu `(ime, serijsko vreme, paralelno vreme, serijski potez, paralelni potez)`.
+    """
+    rows = []
+    for name, board, mode in positions:
+        start_time = time.time()
+        serial_move = Search(time_limit=float('inf')).run(board, max_depth, mode)
+        serial_time = time.time() - start_time
+
+        parallel = ParallelSearch(workers, time_limit=float('inf'))
+        parallel.start()
+        start_time = time.time()
+        parallel_move = parallel.run(board, max_depth, mode)
+        parallel_time = time.time() - start_time
+        parallel.close()
+        rows.append((name, serial_time, parallel_time, serial_move, parallel_move))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.parallel', description='Merenje paralelne pretrage.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    root = commands.add_parser('root', help='ubrzanje podele poteza iz korena u odnosu na serijsku pretragu')
+    root.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='broj procesa radnika')
+    root.add_argument('--depth', type=int, default=8, help='dubina pretrage')
+    lazy = commands.add_parser('lazy', help='vreme do dubine i pogoci u deljenoj tabeli za Lazy SMP')
+    lazy.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='broj procesa radnika za svako merenje')
+    lazy.add_argument('--depth', type=int, default=8, help='dubina pretrage')
+    args = parser.parse_args(argv)
+
+    if args.command == 'lazy':
+        print(f"{'radnika':>7} {'vreme':>10} {'cvorova':>10} {'pogodaka %':>11}")
+        for workers, total_time, nodes, hit_rate in measure_lazy_smp(args.workers, args.depth):
+            print(f"{workers:7} {total_time:10.3f} {nodes:10} {hit_rate:11.1f}")
+        return
+
+    print(f"{'pozicija':32} {'serijski':>10} {'paralelno':>10} {'ubrzanje':>9}")
+    total_serial = total_parallel = 0
+    for name, serial_time, parallel_time, serial_move, parallel_move in measure_speedup(args.workers, args.depth):
+        total_serial += serial_time
+        total_parallel += parallel_time
+        print(f"{name:32} {serial_time:10.3f} {parallel_time:10.3f} {serial_time / parallel_time:9.2f}"
+              f"   {move_to_string(serial_move)} | {move_to_string(parallel_move)}")
+    print(f"{'ukupno':32} {total_serial:10.3f} {total_parallel:10.3f} {total_serial / total_parallel:9.2f}")
+
+if __name__ == '__main__':
+    main()
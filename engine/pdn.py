@@ -0,0 +1,340 @@
+import argparse
+import json
+import re
+import sys
+import time
+from .bitboard import BitBoard, SQUARES, bits, pack_bytes
+from .constants import WHITE, BROWN
+
+# zapis pozicija i partija u standardnoj notaciji za dame (PDN, i FEN unutar PDN-a).
+# Polja su numerisana od 1 do 32 kao u standardnom dijagramu: braon igra prvi kao crni u standardu,
+# pa njegova pocetna polja imaju brojeve 1-12, a bela 21-32; broj polja je `SQUARES - sq`
+# (tabla je okrenuta za 180 stepeni u odnosu na numeraciju `bitboard.square`).
+# Rezultat "1-0" znaci da je pobedio braon (igrac koji igra prvi), a "0-1" da je pobedio beli.
+RESULTS = {"BROWN": "1-0", "WHITE": "0-1", "DRAW": "1/2-1/2"}
+UNKNOWN_RESULT = "*"
+# oznake kraja partije; dvocifreni rezultati se koriste u PDN-u za dame 10x10
+RESULT_TOKENS = ("1-0", "0-1", "1/2-1/2", "2-0", "0-2", "1-1", "0-0", UNKNOWN_RESULT)
+# oznaka sa rezimom igre (nije standardna); partije bez nje su sa obaveznim jedenjem
+MODE_TAG = "Mode"
+LINE_LENGTH = 79
+
+TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN = re.compile(r'[{}();\[\]]|\d+\.+|[^\s{}();\[\]]+')
+MOVE = re.compile(r'\d+(?:[-x]\d+)+')
+
+def square_number(sq):
+    """
+    Funkcija vraca broj polja u notaciji (1-32) za indeks tamnog polja.
+    """
+    return SQUARES - sq
+
+def number_square(number):
+    """
+    Funkcija vraca indeks tamnog polja za broj polja u notaciji (1-32).
+    """
+    if not 1 <= number <= SQUARES:
+        raise ValueError(f"Neispravan broj polja: {number}")
+    return SQUARES - number
+
+def to_fen(board):
+    """
+    Funkcija vraca poziciju u FEN obliku, npr. `B:W21,22,K30:B1,2,3`:
+    igrac na potezu (`B` za braon, `W` za belog), pa bele i braon figure, kraljice sa `K`.
+    - `board`: BitBoard
+    """
+    fields = ["W" if board.turn == WHITE else "B"]
+    for color, mask in (("W", board.white), ("B", board.brown)):
+        numbers = sorted(square_number(sq) for sq in bits(mask))
+        fields.append(color + ",".join(("K" if board.queens >> number_square(n) & 1 else "") + str(n) for n in numbers))
+    return ":".join(fields)
+
+def from_fen(fen):
+    """
+    Funkcija pravi BitBoard od pozicije u FEN obliku (vidi `to_fen`).
+    Prihvata i opsege polja (`W21-32`), navodnike oko pozicije i tacku na kraju.
+    """
+    text = fen.strip().strip('"').strip().rstrip(".")
+    fields = text.split(":")
+    side = fields[0].strip().upper()
+    if side not in ("W", "B"):
+        raise ValueError(f"Neispravan igrac na potezu u FEN-u: {fen!r}")
+    white = brown = queens = 0
+    for field in fields[1:]:
+        field = field.strip()
+        if not field:
+            continue
+        color = field[0].upper()
+        if color not in ("W", "B"):
+            raise ValueError(f"Neispravna boja u FEN-u: {field!r}")
+        for item in field[1:].split(","):
+            item = item.strip()
+            if not item:
+                continue
+            queen = item[0].upper() == "K"
+            if queen:
+                item = item[1:]
+            try:
+                first, _, last = item.partition("-")
+                numbers = range(int(first), int(last or first) + 1)
+            except ValueError:
+                raise ValueError(f"Neispravno polje u FEN-u: {item!r}") from None
+            for number in numbers:
+                bit = 1 << number_square(number)
+                if (white | brown) & bit:
+                    raise ValueError(f"Polje {number} je navedeno vise puta u FEN-u")
+                if color == "W":
+                    white |= bit
+                else:
+                    brown |= bit
+                if queen:
+                    queens |= bit
+    return BitBoard(white, brown, queens, WHITE if side == "W" else BROWN)
+
+def move_to_pdn(move):
+    """
+    Funkcija vraca potez u notaciji: `11-15` za obican potez, `15x24` za jedenje
+    (samo polazno i ciljno polje, jer figura ima najvise jedan potez do istog polja).
+    """
+    frm, to, captured = move
+    return f"{square_number(frm)}{'x' if captured else '-'}{square_number(to)}"
+
+def parse_move(board, text, mode):
+    """
+    Funkcija vraca potez `(sa, na, maska pojedenih figura)` iz notacije za igraca koji je na potezu.
+    Uzimaju se polazno i poslednje polje, pa je visestruko jedenje moguce zapisati i sa medjupoljima (`15x24x31`).
+    - `board`: BitBoard pre poteza
+    - `text`: potez u notaciji
+    - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+    """
+    if not MOVE.fullmatch(text):
+        raise ValueError(f"Neispravan potez: {text!r}")
+    numbers = [int(number) for number in re.split(r"[-x]", text)]
+    frm, to = number_square(numbers[0]), number_square(numbers[-1])
+    for move in board.generate_moves(board.turn, mode):
+        if move[0] == frm and move[1] == to:
+            return move
+    raise ValueError(f"Nemoguc potez {text} u poziciji {to_fen(board)}")
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def write_game(moves, result=UNKNOWN_RESULT, tags=None, start=None, mode=1):
+    """
+    Funkcija vraca partiju u PDN obliku, sa oznakama i potezima podeljenim u redove.
+    - `moves`: lista poteza `(sa, na, maska pojedenih figura)`
+    - `result`: rezultat u notaciji ("1-0", "0-1", "1/2-1/2" ili "*"), ili kao u `selfplay` ("BROWN", "WHITE", "DRAW")
+    - `tags`: recnik dodatnih oznaka (npr. Event, Black, White)
+    - `start`: pocetna pozicija (BitBoard) ako partija ne pocinje od standardne
+    """
+    result = RESULTS.get(result, result)
+    headers = dict(tags or {})
+    headers["Result"] = result
+    headers[MODE_TAG] = str(mode)
+    if start is not None:
+        headers["SetUp"] = "1"
+        headers["FEN"] = to_fen(start)
+    lines = [f'[{name} "{escape(str(value))}"]' for name, value in headers.items()]
+    lines.append("")
+
+    turn = start.turn if start is not None else BROWN
+    tokens = []
+    for index, move in enumerate(moves):
+        # broj poteza ostaje u istom redu sa potezom
+        ply = index + (turn == WHITE)
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}. {move_to_pdn(move)}")
+        elif index == 0:
+            tokens.append(f"{ply // 2 + 1}... {move_to_pdn(move)}")
+        else:
+            tokens.append(move_to_pdn(move))
+    tokens.append(result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+def read_games(lines):
+    """
+    Generator koji cita PDN partiju po partiju iz niza linija (npr. otvorenog fajla), bez ucitavanja
+    celog fajla, pa radi i za zbirke od vise gigabajta. Vraca recnike
+    `{"tags": oznake, "moves": potezi u notaciji, "result": rezultat ili None}`.
+    Komentari (`{...}`, `;`), varijante (`(...)`), brojevi poteza i oznake `$n` se preskacu.
+    Partija se zavrsava rezultatom, novim oznakama posle poteza ili krajem fajla.
+    """
+    game = {"tags": {}, "moves": [], "result": None}
+    in_comment = False
+    variation = 0
+    for line in lines:
+        if in_comment:
+            end = line.find("}")
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("[") and not variation:
+            tags = TAG.findall(stripped)
+            if tags:
+                if game["moves"]:
+                    yield game
+                    game = {"tags": {}, "moves": [], "result": None}
+                for name, value in tags:
+                    game["tags"][name] = re.sub(r'\\(.)', r'\1', value)
+                continue
+
+        pos = 0
+        while True:
+            match = TOKEN.search(line, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+            if token == "{":
+                end = line.find("}", pos)
+                if end < 0:
+                    in_comment = True
+                    break
+                pos = end + 1
+            elif token == ";":
+                break
+            elif token == "(":
+                variation += 1
+            elif token == ")":
+                variation = max(variation - 1, 0)
+            elif variation or token in ("[", "]") or token[0] == "$" or token[-1] == ".":
+                continue
+            elif token in RESULT_TOKENS:
+                game["result"] = token
+                yield game
+                game = {"tags": {}, "moves": [], "result": None}
+            else:
+                game["moves"].append(token.rstrip("!?"))
+    if game["moves"] or game["tags"]:
+        yield game
+
+def start_position(game):
+    """
+    Funkcija vraca `(pocetna pozicija, rezim igre)` partije iz `read_games`.
+    """
+    fen = game["tags"].get("FEN")
+    board = from_fen(fen) if fen else BitBoard(turn=BROWN)
+    try:
+        mode = int(game["tags"].get(MODE_TAG, 1))
+    except ValueError:
+        raise ValueError(f"Neispravan rezim igre: {game['tags'][MODE_TAG]!r}") from None
+    return board, mode
+
+def game_moves(game):
+    """
+    Generator koji vraca `(pozicija, potez)` za svaki potez partije iz `read_games`.
+    Pozicija je ista tabla koja se menja posle svakog poteza; za cuvanje treba uzeti `board.pack()`.
+    """
+    board, mode = start_position(game)
+    for text in game["moves"]:
+        move = parse_move(board, text, mode)
+        yield board, move
+        board.apply_move(move)
+
+def game_positions(game, packed=False):
+    """
+    Generator koji vraca sve pozicije partije iz `read_games`, od pocetne do poslednje,
+    kao nove BitBoard objekte ili kao upakovane pozicije (`packed`, vidi `bitboard.pack`).
+    """
+    board, mode = start_position(game)
+    yield board.pack() if packed else BitBoard.from_packed(board.pack())
+    for text in game["moves"]:
+        board.apply_move(parse_move(board, text, mode))
+        yield board.pack() if packed else BitBoard.from_packed(board.pack())
+
+def read_positions(lines, packed=False, skip_errors=False):
+    """
+    Generator koji vraca pozicije svih partija iz PDN zbirke (vidi `read_games` i `game_positions`).
+    - `skip_errors`: ako je postavljen, cela partija sa neispravnim potezom ili pozicijom se preskace
+      umesto da se podigne ValueError
+    """
+    for game in read_games(lines):
+        try:
+            positions = list(game_positions(game, packed))
+        except ValueError:
+            if not skip_errors:
+                raise
+            continue
+        yield from positions
+
+def selfplay_to_pdn(game):
+    """
+    Funkcija vraca partiju iz `python -m engine.selfplay` (recnik iz JSON linije) u PDN obliku.
+    """
+    moves = [tuple(move) for move in game["opening"] + game["moves"]]
+    tags = {"Event": "selfplay", "Round": game["id"], "Black": "engine", "White": "engine"}
+    return write_game(moves, game["result"], tags, mode=game["mode"])
+
+def open_input(path):
+    return sys.stdin if path == "-" else open(path, encoding="utf-8", errors="replace")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.pdn', description='Citanje i pisanje partija u PDN notaciji.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    positions = commands.add_parser('positions', help='sve pozicije iz PDN zbirke u binarni fajl za engine.batch')
+    positions.add_argument('input', help='PDN fajl ("-" za standardni ulaz)')
+    positions.add_argument('output', help='fajl sa po 16 bajtova po poziciji')
+    positions.add_argument('--skip-errors', action='store_true', help='preskoci partije sa neispravnim potezima')
+    convert = commands.add_parser('selfplay', help='partije iz python -m engine.selfplay u PDN')
+    convert.add_argument('input', help='fajl sa JSON linijama ("-" za standardni ulaz)')
+    convert.add_argument('output', nargs='?', default='-', help='PDN fajl ("-" za standardni izlaz)')
+    fen = commands.add_parser('fen', help='FEN pozicija posle svakog poteza partija iz PDN fajla')
+    fen.add_argument('input', help='PDN fajl ("-" za standardni ulaz)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'selfplay':
+        output = sys.stdout if args.output == '-' else open(args.output, 'w')
+        try:
+            with open_input(args.input) as f:
+                for line in f:
+                    if line.strip():
+                        output.write(selfplay_to_pdn(json.loads(line)))
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
+
+    if args.command == 'fen':
+        with open_input(args.input) as f:
+            for game in read_games(f):
+                for board in game_positions(game):
+                    print(to_fen(board))
+                print()
+        return
+
+    start_time = time.time()
+    games = count = skipped = 0
+    with open_input(args.input) as f, open(args.output, 'wb') as output:
+        buffer = []
+        for game in read_games(f):
+            games += 1
+            # pozicije partije se dodaju tek kad su svi potezi ispravni, pa se neispravna partija preskace cela
+            try:
+                buffer.extend([pack_bytes(packed) for packed in game_positions(game, packed=True)])
+            except ValueError as error:
+                if not args.skip_errors:
+                    raise SystemExit(f"Partija {games}: {error}")
+                skipped += 1
+            if len(buffer) >= 1 << 16:
+                output.write(b"".join(buffer))
+                count += len(buffer)
+                buffer = []
+        output.write(b"".join(buffer))
+        count += len(buffer)
+    print(f"{games} partija, {count} pozicija, {skipped} preskoceno, {time.time() - start_time:.3f} s")
+
+if __name__ == '__main__':
+    main()
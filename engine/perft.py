@@ -0,0 +1,129 @@
+import argparse
+import random
+import sys
+import time
+from .bitboard import BitBoard, move_to_string
+from .constants import BROWN
+from .positions import POSITIONS
+
+# najveca dozvoljena razlika izmedju `evaluate_state` i `evaluate_state_full` (greska zaokruzivanja)
+EVALUATION_TOLERANCE = 1e-6
+
+# broj listova do dubine 1, 2, ... za svaku poziciju i rezim; do dubine 5 proveren sa generatorom poteza iz Board
+PERFT_RESULTS = {
+    ("pocetna", 1): [7, 49, 302, 1469, 7361, 37205, 182906, 873318],
+    ("pocetna", 0): [7, 49, 379, 2872, 23582, 190647, 1607272, 13411735],
+    ("sredina", 1): [2, 16, 93, 362, 2050, 7901, 46683, 206284],
+    ("sredina", 0): [10, 85, 837, 7269, 71103, 636325, 6155452, 56006883],
+    ("sredina bez obaveznog jedenja", 1): [9, 71, 404, 2710, 14537, 88250, 457849, 2622355],
+    ("sredina bez obaveznog jedenja", 0): [9, 79, 668, 5803, 46987, 406598, 3168785, 27325528],
+    ("kraljice", 1): [6, 18, 97, 384, 2252, 8535, 49567, 191224],
+    ("kraljice", 0): [6, 18, 138, 592, 4719, 20366, 169276, 762711],
+    ("visestruko jedenje", 1): [3, 18, 139, 1006, 7457, 52593, 355079, 2366660],
+    ("visestruko jedenje", 0): [9, 86, 705, 6445, 52320, 470233, 3778071, 33610575],
+}
+
+def perft(board, depth, mode):
+    """
+    Funkcija vraca broj listova stabla igre do zadate dubine.
+    Pozicija bez poteza pre zadate dubine se ne broji.
+    - `board`: pozicija kao `BitBoard`; posle brojanja ostaje nepromenjena
+    - `depth`: dubina brojanja
+    - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+    """
+    moves = board.generate_moves(board.turn, mode)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = board.apply_move(move)
+        nodes += perft(board, depth - 1, mode)
+        board.undo_move(undo)
+    return nodes
+
+def divide(board, depth, mode):
+    """
+    Funkcija vraca listu `(potez, broj listova)` za svaki potez iz korena.
+    """
+    results = []
+    for move in board.generate_moves(board.turn, mode):
+        undo = board.apply_move(move)
+        results.append((move, perft(board, depth - 1, mode) if depth > 1 else 1))
+        board.undo_move(undo)
+    return results
+
+def check(max_depth=None):
+    """
+    Funkcija broji listove za sve pozicije iz `PERFT_RESULTS` i poredi ih sa sacuvanim brojevima.
+    Vraca listu `(ime, rezim, dubina, ocekivano, dobijeno, vreme)`.
+    """
+    rows = []
+    for (name, mode), expected in PERFT_RESULTS.items():
+        board = POSITIONS[name]
+        for depth, count in enumerate(expected, 1):
+            if max_depth is not None and depth > max_depth:
+                break
+            start_time = time.time()
+            nodes = perft(board, depth, mode)
+            rows.append((name, mode, depth, count, nodes, time.time() - start_time))
+    return rows
+
+def check_evaluation(games=200, seed=0, max_plies=120):
+    """
+    Funkcija poredi `evaluate_state` (inkrementalni zbirovi) sa `evaluate_state_full` (prolazak kroz sve figure)
+    u svim pozicijama nasumicnih partija, za oba igraca, i vraca `(broj pozicija, najveca razlika)`.
+    """
+    rng = random.Random(seed)
+    count = 0
+    difference = 0.0
+    for game in range(games):
+        board = BitBoard(turn=BROWN)
+        mode = game % 2
+        for _ in range(max_plies):
+            for maximizing_player in (True, False):
+                fast = board.evaluate_state(maximizing_player)
+                full = board.evaluate_state_full(maximizing_player)
+                difference = max(difference, 0.0 if fast == full else abs(fast - full))
+            count += 1
+            moves = board.generate_moves(board.turn, mode)
+            if not moves:
+                break
+            board.apply_move(rng.choice(moves))
+    return count, difference
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.perft', description='Brojanje listova stabla igre (perft).')
+    parser.add_argument('--position', choices=sorted(POSITIONS), default='pocetna', help='pozicija iz engine.positions')
+    parser.add_argument('--mode', type=int, choices=(0, 1), default=1, help='1 ako je jedenje obavezno, 0 ako nije')
+    parser.add_argument('--depth', type=int, default=6, help='dubina brojanja')
+    parser.add_argument('--divide', action='store_true', help='broj listova posebno za svaki potez iz korena')
+    parser.add_argument('--check', action='store_true', help='provera svih sacuvanih brojeva (do --depth) i evaluacije na nasumicnim pozicijama')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failed = 0
+        for name, mode, depth, expected, nodes, elapsed in check(args.depth):
+            status = "ok" if nodes == expected else "GRESKA"
+            failed += nodes != expected
+            print(f"{name:30} {mode} {depth:2} {nodes:12} {expected:12} {nodes / max(elapsed, 1e-9):12.0f} cvorova/s  {status}")
+        count, difference = check_evaluation()
+        status = "ok" if difference <= EVALUATION_TOLERANCE else "GRESKA"
+        failed += difference > EVALUATION_TOLERANCE
+        print(f"{'evaluacija':30} {count} pozicija, najveca razlika {difference:.2e}  {status}")
+        sys.exit(1 if failed else 0)
+
+    board = POSITIONS[args.position]
+    start_time = time.time()
+    if args.divide:
+        nodes = 0
+        for move, count in divide(board, args.depth, args.mode):
+            nodes += count
+            print(f"{move_to_string(move):40} {count}")
+    else:
+        nodes = perft(board, args.depth, args.mode)
+    elapsed = time.time() - start_time
+    print(f"Nodes: {nodes}")
+    print(f"Time taken: {elapsed:.3f} s, {nodes / max(elapsed, 1e-9):.0f} nodes/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from .bitboard import BitBoard
+from .constants import BROWN
+
+# imenovane pozicije za merenja i proveru generatora poteza; braon je na potezu u svakoj
+POSITIONS = {
+    "pocetna": BitBoard(turn=BROWN),
+    "sredina": BitBoard.from_string("""
+        0w0w0w0w
+        w000w0w0
+        0w000000
+        0000b0b0
+        0000000b
+        b0w00000
+        0b0b000b
+        b0b000b0
+    """, BROWN),
+    "sredina bez obaveznog jedenja": BitBoard.from_string("""
+        0w0w000w
+        w000w0w0
+        00000000
+        00000000
+        0b0b0000
+        b00000w0
+        00000000
+        b000b0b0
+    """, BROWN),
+    "kraljice": BitBoard.from_string("""
+        00000B00
+        00w00000
+        0w000000
+        b0000000
+        0000000w
+        00000000
+        000b0000
+        b0b00000
+    """, BROWN),
+    "visestruko jedenje": BitBoard.from_string("""
+        0w0w0w00
+        w0000000
+        0000000w
+        0000w000
+        00000000
+        00w00000
+        0b0b0B00
+        b0b00000
+    """, BROWN),
+}
@@ -0,0 +1,383 @@
+import time
+from .constants import BROWN, WHITE
+from .bitboard import BitBoard, EVAL_SCALE
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER, NO_MOVE, encode_move
+from .ordering import MoveOrdering
+from .timecontrol import predict_iteration
+from .zobrist_hashing import zobrist_mode
+
+CUTOFF_SLOTS = 8
+# broj cvorova izmedju dve provere sata i zahteva za prekid
+CHECK_INTERVAL = 512
+# sirina nultog prozora; manja od najmanje razlike dva razlicita skora (1 / EVAL_SCALE)
+NULL_WINDOW = 0.5 / EVAL_SCALE
+# pocetna polusirina aspiracionog prozora oko skora prethodne iteracije (oko jednog pesaka),
+# prozor se posle promasaja siri 4 puta, a preko MAX_ASPIRATION_WINDOW postaje beskonacan
+ASPIRATION_WINDOW = 25
+MAX_ASPIRATION_WINDOW = 1600
+# skorovi dobijene ili izgubljene partije (i iz tabela zavrsnica) se ne pretrazuju sa aspiracionim prozorom
+WIN_THRESHOLD = 50000
+
+
+class SearchStats(object):
+    """
+    Statistika jedne iteracije iterativnog produbljivanja.
+    - `depth`: dubina iteracije
+    - `completed`: False ako je iteracija prekinuta zbog isteka vremena
+    - `nodes`, `leaf_evals`: broj posecenih cvorova i broj evaluacija listova
+    - `tt_probes`, `tt_hits`, `tt_cutoffs`: upiti u transpozicionu tabelu, pogoci i odsecanja bez pretrage
+    - `tb_hits`: cvorovi ciji je skor procitan iz tabela zavrsnica
+    - `beta_cutoffs`: broj beta odsecanja; `cutoff_moves[i]` je broj odsecanja na i-tom potezu
+      po redosledu (poslednje mesto broji i sve kasnije poteze)
+    - `researches`: ponovljene pretrage poteza cija je pretraga sa nultim prozorom pala van prozora
+    - `aspiration_researches`: ponovljene pretrage korena posle promasaja aspiracionog prozora
+    - `branching_factor`: odnos broja cvorova ove i prethodne iteracije
+    - `time`: trajanje iteracije u sekundama
+    - `value`, `move`: skor i najbolji potez iteracije
+    """
+    def __init__(self, depth):
+        self.depth = depth
+        self.completed = False
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.tb_hits = 0
+        self.beta_cutoffs = 0
+        self.cutoff_moves = [0] * CUTOFF_SLOTS
+        self.researches = 0
+        self.aspiration_researches = 0
+        self.branching_factor = 0.0
+        self.time = 0.0
+        self.value = None
+        self.move = None
+
+    def first_move_cutoff_rate(self):
+        """
+        Funkcija vraca udeo beta odsecanja na prvom potezu, meru kvaliteta redosleda poteza.
+        """
+        return self.cutoff_moves[0] / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def __str__(self):
+        hit_rate = self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+        return (f"depth {self.depth}{'' if self.completed else ' (stopped)'}: {self.nodes} nodes, "
+                f"{self.leaf_evals} evals, TT {hit_rate:.0%} hits / {self.tt_cutoffs} cutoffs, "
+                f"{self.beta_cutoffs} beta cutoffs ({self.first_move_cutoff_rate():.0%} on first move), "
+                f"{self.researches} re-searches, {self.aspiration_researches} aspiration re-searches, "
+                f"EBF {self.branching_factor:.2f}, {self.time:.3f} s")
+
+
+class Search(object):
+    """
+    Alfa-beta pretraga sa iterativnim produbljivanjem nad `BitBoard` tablom.
+    Prvi potez u svakom cvoru se pretrazuje sa punim prozorom, a ostali sa nultim prozorom (PVS)
+    i ponovo samo ako pretraga sa nultim prozorom padne van njega. Svaka iteracija pocinje
+    sa aspiracionim prozorom oko skora prethodne iteracije.
+    Transpoziciona tabela traje izmedju poziva, pa se koristi i za sledece poteze iste partije.
+    - `table`: transpoziciona tabela; ako nije zadata, pravi se pri prvoj pretrazi
+    - `time_limit`: vreme u sekundama posle kojeg se pretraga prekida
+    Nova iteracija ne pocinje ako se proceni da se ne moze zavrsiti pre isteka vremena,
+    a prekinuta iteracija ne menja najbolji potez zavrsenih iteracija.
+    Tokom pretrage `depth` i `nodes` sadrze trenutnu dubinu i broj posecenih cvorova,
+    pa ih druga nit moze citati. Posle pretrage `iterations` sadrzi `(dubina, skor, potez)`
+    za svaku iteraciju koja je zavrsena pre isteka vremena, a `stats` po jedan `SearchStats`
+    za svaku zapocetu iteraciju.
+    - `callback`: funkcija koja se poziva sa `SearchStats` posle svake iteracije
+    - `batch_leaves`: ako je True, svi listovi ispod cvora na dubini 1 se ocenjuju odjednom
+      sa `batch.evaluate_batch` (potreban je numpy)
+    - `book`: knjiga otvaranja (`book.OpeningBook`); ako je pozicija u knjizi, potez se vraca bez pretrage
+    - `tablebase`: tabele zavrsnica (`tablebase.Tablebase`); pozicije iz tabela dobijaju tacan skor bez pretrage
+    - `time_control`: sat partije (`timecontrol.TimeControl`); ako je zadat, vreme za potez se racuna iz
+      preostalog vremena umesto iz `time_limit`, a posle pretrage se potroseno vreme oduzima sa sata
+    - `check_interval`: broj cvorova izmedju dve provere sata
+    - `node_limit`: najveci broj cvorova pretrage; nova iteracija ne pocinje ako se proceni da bi ga prekoracila
+    - `deterministic`: ako je True, vreme se ne meri, a transpoziciona tabela se prazni pre svake pretrage,
+      pa ista pozicija sa istim podesavanjima uvek daje isti potez i isti broj cvorova
+      (pretraga se tada ogranicava dubinom i sa `node_limit`)
+    """
+    def __init__(self, table=None, time_limit=2.8, callback=None, batch_leaves=False, book=None, tablebase=None,
+                 time_control=None, check_interval=CHECK_INTERVAL, node_limit=None, deterministic=False):
+        self.table = table
+        self.time_limit = time_limit
+        self.callback = callback
+        self.batch_leaves = batch_leaves
+        self.book = book
+        self.tablebase = tablebase
+        self.time_control = time_control
+        self.check_interval = check_interval
+        self.node_limit = node_limit
+        self.deterministic = deterministic
+        self.depth = 0
+        self.nodes = 0
+        self.iterations = []
+        self.stats = []
+
+    def run(self, board, max_depth, mode, cancel=None, root_moves=None, start_depth=3):
+        """
+        Funkcija vraca najbolji potez `(sa, na, maska pojedenih figura)` za igraca koji je na potezu,
+        ili None ako poteza nema.
+        - `board`: pozicija koja se pretrazuje; posle pretrage ostaje nepromenjena
+        - `max_depth`: najveca dubina iterativnog produbljivanja
+        - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+        - `cancel`: `threading.Event`; kada se postavi, pretraga se prekida i vraca najbolji do tada nadjen potez
+        - `root_moves`: ako je zadat, u korenu se pretrazuju samo ovi potezi
+        - `start_depth`: dubina od koje pocinje iterativno produbljivanje
+        """
+        start_time = time.monotonic()
+        time_control = self.time_control
+        if self.book is not None and root_moves is None:
+            entry = self.book.probe(board, mode)
+            if entry is not None:
+                move, score = entry
+                self.depth = 0
+                self.nodes = 0
+                self.iterations = [(0, score, move)]
+                self.stats = []
+                if time_control is not None:
+                    time_control.update(time.monotonic() - start_time)
+                return move
+        if self.table is None:
+            self.table = TranspositionTable()
+        table = self.table
+        if self.deterministic:
+            table.clear()
+            soft_limit = hard_limit = float('inf')
+        elif time_control is not None:
+            soft_limit, hard_limit = time_control.limits()
+        else:
+            soft_limit = hard_limit = self.time_limit
+        deadline = start_time + hard_limit
+        node_limit = self.node_limit if self.node_limit is not None else float('inf')
+        check_interval = self.check_interval
+        next_check = min(check_interval, node_limit)
+        stop = False
+        search_board = BitBoard(board.white, board.brown, board.queens, board.turn)
+        mode_key = zobrist_mode if mode == 1 else 0
+        root_depth = 0
+        ordering = MoveOrdering()
+        table.new_search()
+        self.depth = 0
+        self.nodes = 0
+        self.iterations = []
+        self.stats = []
+        stats = None
+        batch_leaves = self.batch_leaves
+        tablebase = self.tablebase
+        tablebase_pieces = tablebase.max_pieces if tablebase is not None else 0
+        if batch_leaves:
+            from .batch import evaluate_batch
+
+        def check_time():
+            nonlocal stop, next_check
+            next_check = min(self.nodes + check_interval, node_limit)
+            stop = self.nodes >= node_limit or time.monotonic() > deadline or (cancel is not None and cancel.is_set())
+            return stop
+
+        def alpha_beta(depth, alpha, beta, maximizing_player):
+            self.nodes += 1
+            stats.nodes += 1
+            # ogranicenja se proveravaju i u listovima, pa pretraga ne obidje nijedan cvor preko `node_limit`
+            if stop or (self.nodes >= next_check and check_time()):
+                stats.leaf_evals += 1
+                return search_board.evaluate_state(maximizing_player), None
+            if tablebase_pieces and depth < root_depth and (search_board.white | search_board.brown).bit_count() <= tablebase_pieces:
+                score = tablebase.probe(search_board, mode)
+                if score is not None:
+                    stats.tb_hits += 1
+                    return score, None
+            if depth == 0:
+                stats.leaf_evals += 1
+                return search_board.evaluate_state(maximizing_player), None
+
+            if root_moves is not None and depth == root_depth:
+                moves = root_moves
+            else:
+                moves = search_board.generate_moves(WHITE if maximizing_player else BROWN, mode)
+            terminal = search_board.get_terminal_score(maximizing_player, moves)
+            if terminal is not None:
+                return terminal, None
+
+            zobrist_key = search_board.zobrist_key ^ mode_key
+            alpha_original = alpha
+            beta_original = beta
+
+            ply = root_depth - depth
+            hash_code = NO_MOVE
+            entry = table.probe(zobrist_key)
+            if entry is not None:
+                tt_depth, tt_score, tt_flag, hash_code = entry
+                if tt_depth >= depth and depth < root_depth:
+                    if tt_flag == EXACT:
+                        stats.tt_cutoffs += 1
+                        return tt_score, None
+                    elif tt_flag == LOWER:
+                        alpha = max(alpha, tt_score)
+                    else:
+                        beta = min(beta, tt_score)
+                    if alpha >= beta:
+                        stats.tt_cutoffs += 1
+                        return tt_score, None
+
+            if batch_leaves and depth == 1 < root_depth:
+                color = WHITE if maximizing_player else BROWN
+                moves = ordering.order(moves, hash_code, ply, color)
+                children = []
+                for move in moves:
+                    undo = search_board.apply_move(move)
+                    children.append((search_board.white, search_board.brown, search_board.queens, search_board.turn == WHITE))
+                    search_board.undo_move(undo)
+                scores = evaluate_batch(children).tolist()
+                self.nodes += len(moves)
+                stats.nodes += len(moves)
+                stats.leaf_evals += len(moves)
+                value = max(scores) if maximizing_player else min(scores)
+                best_move = moves[scores.index(value)]
+                store(zobrist_key, depth, value, alpha_original, beta_original, best_move)
+                return value, best_move
+
+            if maximizing_player:
+                value = float('-inf')
+                best_move = None
+                for index, move in enumerate(ordering.order(moves, hash_code, ply, WHITE)):
+                    undo = search_board.apply_move(move)
+                    if index == 0:
+                        new_value, _ = alpha_beta(depth - 1, alpha, beta, False)
+                    else:
+                        new_value, _ = alpha_beta(depth - 1, alpha, alpha + NULL_WINDOW, False)
+                        if not stop and depth > 1 and alpha < new_value < beta:
+                            stats.researches += 1
+                            new_value, _ = alpha_beta(depth - 1, alpha, beta, False)
+                    search_board.undo_move(undo)
+                    if stop:
+                        # skor prekinute pretrage nije tacan, pa se ne upisuje u tabelu ni u heuristike
+                        return value, best_move or move
+                    if new_value > value:
+                        value = new_value
+                        best_move = move
+                    if value == float('inf'):
+                        break
+                    alpha = max(alpha, value)
+                    if alpha >= beta:
+                        ordering.update(move, ply, depth, WHITE)
+                        stats.beta_cutoffs += 1
+                        stats.cutoff_moves[min(index, CUTOFF_SLOTS - 1)] += 1
+                        break
+                store(zobrist_key, depth, value, alpha_original, beta_original, best_move)
+                return value, best_move
+            else:
+                value = float('inf')
+                best_move = None
+                for index, move in enumerate(ordering.order(moves, hash_code, ply, BROWN)):
+                    undo = search_board.apply_move(move)
+                    if index == 0:
+                        new_value, _ = alpha_beta(depth - 1, alpha, beta, True)
+                    else:
+                        new_value, _ = alpha_beta(depth - 1, beta - NULL_WINDOW, beta, True)
+                        if not stop and depth > 1 and alpha < new_value < beta:
+                            stats.researches += 1
+                            new_value, _ = alpha_beta(depth - 1, alpha, beta, True)
+                    search_board.undo_move(undo)
+                    if stop:
+                        return value, best_move or move
+                    if new_value < value:
+                        value = new_value
+                        best_move = move
+                    if value == float('-inf'):
+                        break
+                    beta = min(beta, value)
+                    if alpha >= beta:
+                        ordering.update(move, ply, depth, BROWN)
+                        stats.beta_cutoffs += 1
+                        stats.cutoff_moves[min(index, CUTOFF_SLOTS - 1)] += 1
+                        break
+                store(zobrist_key, depth, value, alpha_original, beta_original, best_move)
+                return value, best_move
+
+        def store(zobrist_key, depth, value, alpha_original, beta_original, best_move):
+            if stop or (root_moves is not None and depth == root_depth):
+                return
+            if value <= alpha_original:
+                flag = UPPER
+            elif value >= beta_original:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table.store(zobrist_key, depth, value, flag, encode_move(best_move))
+
+        best_move = None
+
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            if self.stats:
+                elapsed = time.monotonic() - start_time
+                predicted_time, predicted_nodes = predict_iteration(self.stats)
+                if elapsed >= soft_limit or elapsed + predicted_time > hard_limit or self.nodes + predicted_nodes > node_limit:
+                    break
+            root_depth = depth
+            self.depth = depth
+            stats = SearchStats(depth)
+            iteration_start = time.monotonic()
+            probes, hits = table.probes, table.hits
+            window = ASPIRATION_WINDOW
+            # skor se menja izmedju parnih i neparnih dubina, pa je centar prozora skor iteracije iste parnosti
+            center = self.iterations[-2][1] if len(self.iterations) >= 2 else None
+            if center is not None and abs(center) < WIN_THRESHOLD:
+                alpha, beta = center - window, center + window
+            else:
+                alpha, beta = float('-inf'), float('inf')
+            while True:
+                value, move = alpha_beta(depth, alpha, beta, search_board.turn == WHITE)
+                if stop or alpha < value < beta:
+                    break
+                stats.aspiration_researches += 1
+                window *= 4
+                if value <= alpha:
+                    alpha = value - window if window <= MAX_ASPIRATION_WINDOW else float('-inf')
+                else:
+                    beta = value + window if window <= MAX_ASPIRATION_WINDOW else float('inf')
+            stats.time = time.monotonic() - iteration_start
+            stats.tt_probes = table.probes - probes
+            stats.tt_hits = table.hits - hits
+            if self.stats and self.stats[-1].nodes:
+                stats.branching_factor = stats.nodes / self.stats[-1].nodes
+            stats.value = value
+            stats.move = move
+            stats.completed = not stop
+            self.stats.append(stats)
+            if self.callback is not None:
+                self.callback(stats)
+            if stats.completed:
+                self.iterations.append((depth, value, move))
+                best_move = move
+            elif best_move is None:
+                # prekinuta je vec prva iteracija, pa je njen potez bolji od nikakvog
+                best_move = move
+            if stop:
+                break
+
+        if time_control is not None:
+            time_control.update(time.monotonic() - start_time)
+        return best_move
+
+
+default_search = None
+
+def alpha_beta_pruning(board, max_depth, turn, mode, time_limit=2.8, time_control=None):
+    """
+    Funkcija trazi najbolji potez za igraca `turn` koristeci zajednicku pretragu modula.
+    - `board`: pozicija kao `BitBoard`
+    - `max_depth`: najveca dubina pretrage
+    - `turn`: igrac koji je na potezu
+    - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+    - `time_limit`: vreme za potez u sekundama, ako nije zadat `time_control`
+    - `time_control`: sat partije (`timecontrol.TimeControl`)
+    """
+    global default_search
+    if default_search is None:
+        default_search = Search()
+    default_search.time_limit = time_limit
+    default_search.time_control = time_control
+    return default_search.run(BitBoard(board.white, board.brown, board.queens, turn), max_depth, mode)
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .bitboard import BitBoard
+from .constants import WHITE, BROWN
+from .search import Search
+from .timecontrol import TimeControl
+
+def random_opening(board, plies, mode, rng):
+    """
+    Funkcija odigrava `plies` nasumicnih poteza iz zadate pozicije i vraca listu odigranih poteza.
+    """
+    opening = []
+    for _ in range(plies):
+        moves = board.generate_moves(board.turn, mode)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        board.apply_move(move)
+        opening.append(list(move))
+    return opening
+
+def get_result(board, mode):
+    """
+    Funkcija vraca "WHITE" ili "BROWN" ako je igra zavrsena, inace None.
+    """
+    moves = board.generate_moves(board.turn, mode)
+    score = board.get_terminal_score(board.turn == WHITE, moves)
+    if score is None:
+        return None
+    return "WHITE" if score > 0 else "BROWN"
+
+def play_game(game_id, mode, max_depth=7, time_limit=2.8, opening_plies=0, seed=0, max_plies=200,
+              white_search=None, brown_search=None, white_depth=None, brown_depth=None, opening_id=None,
+              clock=None, increment=0.0):
+    """
+    Funkcija odigrava jednu partiju racunar protiv racunara, od pocetne pozicije ili od
+    nasumicnog otvaranja odredjenog sa `seed` i `opening_id` (podrazumevano `game_id`).
+    Partija koja nije zavrsena posle `max_plies` poteza je nereseno ("DRAW").
+    Vraca recnik sa potezima, rezultatom, vremenom i brojem cvorova za svaki potez.
+    - `white_search`, `brown_search`: pretrage za belog i braon igraca; podrazumevano nove `Search`
+    - `white_depth`, `brown_depth`: najveca dubina pretrage za svakog igraca; podrazumevano `max_depth`
+    - `clock`, `increment`: ako je `clock` zadat, podrazumevane pretrage igraju sa satom partije
+      (`timecontrol.TimeControl`) umesto sa `time_limit` po potezu
+    """
+    board = BitBoard(turn=BROWN)
+    rng = random.Random(seed * 1000003 + (game_id if opening_id is None else opening_id))
+    opening = random_opening(board, opening_plies, mode, rng)
+    def default_search():
+        return Search(time_limit=time_limit, time_control=TimeControl(clock, increment) if clock is not None else None)
+
+    searches = {
+        WHITE: white_search if white_search is not None else default_search(),
+        BROWN: brown_search if brown_search is not None else default_search(),
+    }
+    depths = {
+        WHITE: white_depth or max_depth,
+        BROWN: brown_depth or max_depth,
+    }
+
+    moves = []
+    times = []
+    nodes = []
+    result = get_result(board, mode)
+    while result is None and len(opening) + len(moves) < max_plies:
+        search = searches[board.turn]
+        start_time = time.time()
+        move = search.run(board, depths[board.turn], mode)
+        times.append(round(time.time() - start_time, 4))
+        nodes.append(search.nodes)
+        board.apply_move(move)
+        moves.append(list(move))
+        result = get_result(board, mode)
+
+    return {
+        "id": game_id,
+        "mode": mode,
+        "seed": seed,
+        "opening": opening,
+        "moves": moves,
+        "result": result or "DRAW",
+        "times": times,
+        "nodes": nodes,
+    }
+
+def run_games(games, workers=None, modes=(1, 0), **options):
+    """
+    Generator koji igra `games` partija u grupi procesa i vraca rezultate redom kojim se partije zavrse.
+    Partija `i` se igra u rezimu `modes[i % len(modes)]`.
+    - `options`: argumenti za `play_game` (max_depth, time_limit, opening_plies, seed, max_plies, clock, increment)
+    """
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as executor:
+        futures = [executor.submit(play_game, game_id, modes[game_id % len(modes)], **options) for game_id in range(games)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.selfplay', description='Partije racunar protiv racunara bez grafickog interfejsa, kao JSON linije.')
+    parser.add_argument('--games', type=int, default=100, help='broj partija')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='broj procesa')
+    parser.add_argument('--modes', type=int, nargs='+', choices=(0, 1), default=[1, 0], help='rezimi igre koji se smenjuju')
+    parser.add_argument('--depth', type=int, default=7, help='najveca dubina pretrage')
+    parser.add_argument('--time-limit', type=float, default=2.8, help='vreme po potezu u sekundama')
+    parser.add_argument('--clock', type=float, help='vreme za celu partiju po igracu u sekundama, umesto --time-limit')
+    parser.add_argument('--increment', type=float, default=0.0, help='dodatak na satu posle svakog poteza u sekundama')
+    parser.add_argument('--opening-plies', type=int, default=0, help='broj nasumicnih poteza na pocetku partije')
+    parser.add_argument('--seed', type=int, default=0, help='seme za nasumicna otvaranja')
+    parser.add_argument('--max-plies', type=int, default=200, help='broj poteza posle kojeg je partija nereseno')
+    parser.add_argument('--output', default='-', help='izlazni fajl ("-" za standardni izlaz)')
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'a')
+    results = {"WHITE": 0, "BROWN": 0, "DRAW": 0}
+    try:
+        for game in run_games(args.games, args.workers, args.modes, max_depth=args.depth, time_limit=args.time_limit,
+                              opening_plies=args.opening_plies, seed=args.seed, max_plies=args.max_plies,
+                              clock=args.clock, increment=args.increment):
+            results[game["result"]] += 1
+            output.write(json.dumps(game) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"WHITE {results['WHITE']}, BROWN {results['BROWN']}, DRAW {results['DRAW']}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+import argparse
+import itertools
+import mmap
+import os
+import time
+from array import array
+from math import comb
+from .bitboard import BitBoard, SQUARES, PROMOTION_SQUARES, NEIGHBOR, UP_DIRECTIONS, DOWN_DIRECTIONS, bits
+from .constants import WHITE, BROWN
+
+# vrednost pozicije za igraca na potezu, jedan bajt po poziciji:
+# 0 nereseno, 1-127 pobeda za toliko poteza, 128 + d poraz za d poteza
+DRAW = 0
+LOSS = 128
+MAX_DISTANCE = 127
+WIN_SCORE = 100000
+
+# polja na kojima pesak ne moze da stoji jer bi postao kraljica
+WHITE_PAWN_SQUARES = [sq for sq in range(SQUARES) if not (1 << sq) & PROMOTION_SQUARES or sq < 4]
+BROWN_PAWN_SQUARES = [sq for sq in range(SQUARES) if not (1 << sq) & PROMOTION_SQUARES or sq >= 28]
+
+def rank(mask):
+    """
+    Funkcija vraca redni broj skupa polja medju svim skupovima iste velicine (kombinatorni brojni sistem).
+    """
+    index = 0
+    for count, sq in enumerate(bits(mask), 1):
+        index += comb(sq, count)
+    return index
+
+def get_signature(white, brown, queens):
+    """
+    Funkcija vraca broj belih pesaka, belih kraljica, braon pesaka i braon kraljica.
+    """
+    return ((white & ~queens).bit_count(), (white & queens).bit_count(),
+            (brown & ~queens).bit_count(), (brown & queens).bit_count())
+
+def table_size(signature):
+    size = 2
+    for count in signature:
+        size *= comb(SQUARES, count)
+    return size
+
+def get_index(white, brown, queens, turn):
+    """
+    Funkcija vraca indeks pozicije u tabeli njenog potpisa.
+    Svaka grupa figura (beli pesaci, bele kraljice, braon pesaci, braon kraljice) je jedna cifra
+    mesovite osnove, a najnizi bit je igrac na potezu.
+    """
+    index = 0
+    for mask in (white & ~queens, white & queens, brown & ~queens, brown & queens):
+        index = index * comb(SQUARES, mask.bit_count()) + rank(mask)
+    return 2 * index + (turn == WHITE)
+
+def file_name(mode, signature):
+    return f"m{mode}_{''.join(str(count) for count in signature)}.tb"
+
+def signatures(max_pieces):
+    """
+    Funkcija vraca sve potpise sa najvise `max_pieces` figura i bar jednom figurom svake boje, redom kojim se
+    racunaju: posle jedenja ima manje figura, a posle promocije manje pesaka, pa su te tabele vec izracunate.
+    """
+    result = []
+    for total in range(2, max_pieces + 1):
+        for white_count in range(1, total):
+            brown_count = total - white_count
+            for white_queens in range(white_count + 1):
+                for brown_queens in range(brown_count + 1):
+                    result.append((white_count - white_queens, white_queens, brown_count - brown_queens, brown_queens))
+    result.sort(key=lambda signature: (sum(signature), signature[0] + signature[2]))
+    return result
+
+def positions(signature):
+    """
+    Generator koji vraca `(bele, braon, kraljice)` za sve ispravne rasporede figura zadatog potpisa.
+    """
+    white_pawns, white_queens, brown_pawns, brown_queens = signature
+    for wp in itertools.combinations(WHITE_PAWN_SQUARES, white_pawns):
+        wp_mask = sum(1 << sq for sq in wp)
+        for wq in itertools.combinations(range(SQUARES), white_queens):
+            wq_mask = sum(1 << sq for sq in wq)
+            if wp_mask & wq_mask:
+                continue
+            white = wp_mask | wq_mask
+            for bp in itertools.combinations(BROWN_PAWN_SQUARES, brown_pawns):
+                bp_mask = sum(1 << sq for sq in bp)
+                if white & bp_mask:
+                    continue
+                for bq in itertools.combinations(range(SQUARES), brown_queens):
+                    bq_mask = sum(1 << sq for sq in bq)
+                    if (white | bp_mask) & bq_mask:
+                        continue
+                    yield white, bp_mask | bq_mask, wq_mask | bq_mask
+
+def child_position(white, brown, queens, turn, move):
+    """
+    Funkcija vraca `(bele, braon, kraljice, promocija)` posle poteza, bez pravljenja nove table.
+    """
+    frm, to, captured = move
+    move_mask = 1 << frm | 1 << to
+    promoted = False
+    if turn == WHITE:
+        white ^= move_mask
+        brown &= ~captured
+    else:
+        brown ^= move_mask
+        white &= ~captured
+    if queens & (1 << frm):
+        queens ^= move_mask
+    elif (1 << to) & PROMOTION_SQUARES:
+        queens |= 1 << to
+        promoted = True
+    return white, brown, queens & ~captured, promoted
+
+def encode(win, distance):
+    if distance > MAX_DISTANCE:
+        raise ValueError(f"Rastojanje {distance} ne staje u jedan bajt")
+    return distance if win else LOSS + distance
+
+def generate_table(signature, mode, tables):
+    """
+    Funkcija racuna tabelu za jedan potpis retrogradnom analizom i vraca je kao bytearray.
+    - `tables`: vec izracunate tabele `{potpis: bytearray}` istog rezima, za pozicije posle jedenja i promocije
+
+    Prvi prolaz generise poteze svake pozicije: pozicije bez poteza su izgubljene, a potezi koji menjaju potpis
+    se ocenjuju iz vec izracunatih tabela. Zatim se vrednosti sire unazad kroz poteze unutar potpisa (obicni potezi
+    bez promocije), redom po rastojanju: pozicija je dobijena ako ima potez u izgubljenu poziciju, a izgubljena
+    kada su svi njeni potezi u dobijene pozicije. Sto ostane neodredjeno je nereseno.
+    """
+    size = table_size(signature)
+    values = bytearray(size)
+    resolved = bytearray(size)
+    # 1 ako pozicija ne moze biti izgubljena: ima potez u nereseno ili u poziciju izgubljenu za protivnika
+    escapes = bytearray(size)
+    remaining = array('H', [0]) * size
+    longest = array('B', [0]) * size
+    buckets = {}
+    board = BitBoard(0, 0, 0)
+
+    def push(index, win, distance):
+        buckets.setdefault(distance, []).append((index, win))
+
+    for white, brown, queens in positions(signature):
+        board.white, board.brown, board.queens = white, brown, queens
+        for turn in (WHITE, BROWN):
+            index = get_index(white, brown, queens, turn)
+            moves = board.generate_moves(turn, mode)
+            if not moves:
+                push(index, False, 0)
+                continue
+            best_win = None
+            internal = 0
+            for move in moves:
+                child_white, child_brown, child_queens, promoted = child_position(white, brown, queens, turn, move)
+                if not move[2] and not promoted:
+                    internal += 1
+                    continue
+                if not child_white or not child_brown:
+                    best_win = 1
+                    continue
+                child_turn = BROWN if turn == WHITE else WHITE
+                value = tables[get_signature(child_white, child_brown, child_queens)][get_index(child_white, child_brown, child_queens, child_turn)]
+                if value == DRAW:
+                    escapes[index] = 1
+                elif value >= LOSS:
+                    if best_win is None or value - LOSS + 1 < best_win:
+                        best_win = value - LOSS + 1
+                else:
+                    longest[index] = max(longest[index], value + 1)
+            remaining[index] = internal
+            if best_win is not None:
+                escapes[index] = 1
+                push(index, True, best_win)
+            elif not internal and not escapes[index]:
+                push(index, False, longest[index])
+
+    distance = 0
+    while buckets:
+        entries = buckets.pop(distance, [])
+        for index, win in entries:
+            if resolved[index]:
+                continue
+            resolved[index] = 1
+            values[index] = encode(win, distance)
+            for parent in predecessors(index, signature, mode):
+                if resolved[parent]:
+                    continue
+                if not win:
+                    push(parent, True, distance + 1)
+                    continue
+                remaining[parent] -= 1
+                longest[parent] = max(longest[parent], distance + 1)
+                if not remaining[parent] and not escapes[parent]:
+                    push(parent, False, longest[parent])
+        distance += 1
+    return values
+
+def decode_index(index, signature):
+    """
+    Funkcija vraca `(bele, braon, kraljice, igrac na potezu)` za indeks pozicije, obrnuto od `get_index`.
+    """
+    turn = WHITE if index & 1 else BROWN
+    index >>= 1
+    masks = []
+    for count in reversed(signature):
+        size = comb(SQUARES, count)
+        index, group = divmod(index, size)
+        masks.append(unrank(group, count))
+    brown_queens, brown_pawns, white_queens, white_pawns = masks
+    return white_pawns | white_queens, brown_pawns | brown_queens, white_queens | brown_queens, turn
+
+def unrank(index, count):
+    mask = 0
+    for k in range(count, 0, -1):
+        sq = k - 1
+        while comb(sq + 1, k) <= index:
+            sq += 1
+        index -= comb(sq, k)
+        mask |= 1 << sq
+    return mask
+
+def predecessors(index, signature, mode):
+    """
+    Generator koji vraca indekse pozicija istog potpisa iz kojih se u zadatu poziciju stize jednim
+    obicnim potezom bez promocije (potezom unazad).
+    """
+    white, brown, queens, turn = decode_index(index, signature)
+    mover = BROWN if turn == WHITE else WHITE
+    own = white if mover == WHITE else brown
+    empty = ~(white | brown) & ((1 << SQUARES) - 1)
+    board = None
+    for to in bits(own):
+        if queens & (1 << to):
+            directions = UP_DIRECTIONS + DOWN_DIRECTIONS
+        elif mover == WHITE:
+            directions = UP_DIRECTIONS
+        else:
+            directions = DOWN_DIRECTIONS
+        for direction in directions:
+            frm = NEIGHBOR[direction][to]
+            if frm < 0 or not empty & (1 << frm):
+                continue
+            move_mask = 1 << frm | 1 << to
+            parent_white = white ^ move_mask if mover == WHITE else white
+            parent_brown = brown ^ move_mask if mover == BROWN else brown
+            parent_queens = queens ^ move_mask if queens & (1 << to) else queens
+            if mode == 1:
+                if board is None:
+                    board = BitBoard(0, 0, 0)
+                board.white, board.brown, board.queens = parent_white, parent_brown, parent_queens
+                if board.get_jumpers(mover):
+                    continue
+            yield get_index(parent_white, parent_brown, parent_queens, mover)
+
+def generate(directory, max_pieces=4, modes=(1, 0), progress=None):
+    """
+    Funkcija racuna sve tabele do `max_pieces` figura za zadate rezime i upisuje ih u direktorijum.
+    - `progress`: funkcija koja se poziva sa `(rezim, potpis, vreme)` posle svake tabele
+    """
+    os.makedirs(directory, exist_ok=True)
+    for mode in modes:
+        tables = {}
+        for signature in signatures(max_pieces):
+            start_time = time.time()
+            tables[signature] = generate_table(signature, mode, tables)
+            with open(os.path.join(directory, file_name(mode, signature)), 'wb') as f:
+                f.write(tables[signature])
+            if progress is not None:
+                progress(mode, signature, time.time() - start_time)
+
+
+class Tablebase(object):
+    """
+    Tabele zavrsnica, mapirane u memoriju (mmap). Tabela za potpis se otvara pri prvom upitu.
+    - `directory`: direktorijum sa tabelama koje je napravio `generate`
+    - `max_pieces`: najveci broj figura za koji se tabele koriste
+    """
+    def __init__(self, directory, max_pieces=4):
+        self.directory = directory
+        self.max_pieces = max_pieces
+        self.tables = {}
+        self.hits = 0
+
+    def close(self):
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = {}
+
+    def get_table(self, mode, signature):
+        key = (mode, signature)
+        if key not in self.tables:
+            path = os.path.join(self.directory, file_name(mode, signature))
+            if os.path.exists(path) and os.path.getsize(path) == table_size(signature):
+                with open(path, 'rb') as f:
+                    self.tables[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.tables[key] = None
+        return self.tables[key]
+
+    def probe_value(self, board, mode):
+        """
+        Funkcija vraca vrednost iz tabele za igraca na potezu (vidi DRAW i LOSS) ili None ako tabele nema.
+        """
+        if (board.white | board.brown).bit_count() > self.max_pieces or not board.white or not board.brown:
+            return None
+        table = self.get_table(mode, get_signature(board.white, board.brown, board.queens))
+        if table is None:
+            return None
+        return table[get_index(board.white, board.brown, board.queens, board.turn)]
+
+    def probe(self, board, mode):
+        """
+        Funkcija vraca skor pozicije iz ugla belog, kao `alpha_beta`, ili None ako pozicija nije u tabelama.
+        Brza pobeda vredi vise: pobeda za d poteza je WIN_SCORE - d.
+        """
+        value = self.probe_value(board, mode)
+        if value is None:
+            return None
+        self.hits += 1
+        if value == DRAW:
+            return 0
+        if value >= LOSS:
+            score = -(WIN_SCORE - (value - LOSS))
+        else:
+            score = WIN_SCORE - value
+        return score if board.turn == WHITE else -score
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m engine.tablebase', description='Tabele zavrsnica retrogradnom analizom.')
+    parser.add_argument('directory', help='direktorijum za tabele')
+    parser.add_argument('--pieces', type=int, default=4, help='najveci broj figura')
+    parser.add_argument('--modes', type=int, nargs='+', choices=(0, 1), default=[1, 0], help='rezimi igre')
+    args = parser.parse_args(argv)
+
+    start_time = time.time()
+    generate(args.directory, args.pieces, args.modes,
+             lambda mode, signature, elapsed: print(f"{file_name(mode, signature):14} {table_size(signature):10} {elapsed:8.2f} s", flush=True))
+    print(f"Time taken: {time.time() - start_time:.1f} s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# procena broja poteza do kraja partije, na koje se deli preostalo vreme
+MOVES_TO_GO = 30
+# tvrdi limit je najvise ovoliko puta duzi od mekog
+HARD_LIMIT_FACTOR = 3
+# najveci deo preostalog vremena koji jedan potez sme da potrosi
+MAX_USAGE = 0.5
+# vreme u sekundama koje se ostavlja za odigravanje poteza posle pretrage
+OVERHEAD = 0.05
+
+
+class TimeControl(object):
+    """
+    Sat jednog igraca za partiju sa osnovnim vremenom i dodatkom posle svakog poteza.
+    Pretraga (`Search` sa `time_control`) pre svakog poteza uzima meki i tvrdi limit sa `limits`,
+    a posle poteza oduzima potroseno vreme sa `update`.
+    - `base`: osnovno vreme za celu partiju u sekundama
+    - `increment`: vreme u sekundama koje se dodaje posle svakog poteza
+    - `moves_to_go`: broj poteza na koje se deli preostalo vreme
+    """
+    def __init__(self, base, increment=0.0, moves_to_go=MOVES_TO_GO):
+        self.base = base
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+        self.remaining = base
+        self.moves = 0
+
+    def limits(self):
+        """
+        Funkcija vraca `(meki limit, tvrdi limit)` u sekundama za sledeci potez.
+        Posle mekog limita pretraga ne pocinje novu iteraciju, a na tvrdom limitu prekida i zapocetu.
+        """
+        available = max(self.remaining - OVERHEAD, 0.0)
+        soft = min(available / self.moves_to_go + self.increment, available * MAX_USAGE)
+        hard = min(soft * HARD_LIMIT_FACTOR, available * MAX_USAGE)
+        return soft, hard
+
+    def update(self, elapsed):
+        """
+        Funkcija oduzima vreme potroseno na potez, dodaje dodatak i vraca preostalo vreme.
+        """
+        self.remaining += self.increment - elapsed
+        self.moves += 1
+        return self.remaining
+
+    def reset(self):
+        self.remaining = self.base
+        self.moves = 0
+
+    def __str__(self):
+        return f"{self.remaining:.2f} s left after {self.moves} moves (+{self.increment:g} s per move)"
+
+
+def predict_iteration(stats):
+    """
+    Funkcija procenjuje trajanje i broj cvorova sledece iteracije iterativnog produbljivanja
+    iz liste `SearchStats` zavrsenih iteracija. Vraca `(vreme, broj cvorova)`, ili `(0, 0)` ako procena jos nije moguca.
+    Broj cvorova raste naizmenicno sporije i brze izmedju parnih i neparnih dubina,
+    pa se koristi faktor grananja poslednje iteracije iste parnosti kao sledeca.
+    """
+    if not stats or not stats[-1].completed:
+        return 0.0, 0
+    if len(stats) >= 3 and stats[-2].branching_factor:
+        factor = stats[-2].branching_factor
+    else:
+        factor = stats[-1].branching_factor
+    return stats[-1].time * factor, round(stats[-1].nodes * factor)
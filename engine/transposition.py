@@ -0,0 +1,263 @@
+import math
+import multiprocessing
+import os
+import struct
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from .bitboard import EVAL_SCALE
+from .zobrist_hashing import ZOBRIST_SEED, ZOBRIST_VERSION
+
+EXACT, LOWER, UPPER = 0, 1, 2
+NO_MOVE = 0xFFFF
+EMPTY = -1
+
+# kljuc (8) + dubina (1) + skor (8) + granica (1) + potez (2) + starost (1)
+ENTRY_SIZE = 21
+
+# fajl sacuvane tabele: zaglavlje (oznaka, verzija formata, verzija i seme zobrist kljuceva, broj unosa),
+# pa unosi (kljuc, skor pomnozen sa EVAL_SCALE, kod poteza, dubina, granica) od najdubljeg ka najplicem
+TABLE_MAGIC = b'CKTT'
+TABLE_VERSION = 2
+TABLE_HEADER = struct.Struct('<4sHHQI')
+TABLE_RECORD = struct.Struct('<QiHbB')
+# plici unosi se brzo ponovo izracunaju, pa se ne cuvaju
+MIN_SAVE_DEPTH = 3
+
+def encode_move(move):
+    """
+    Funkcija pakuje potez `(sa, na, maska pojedenih figura)` u jedan broj.
+    Polazno i ciljno polje su dovoljni jer figura ima najvise jedan potez do istog polja.
+    """
+    if move is None:
+        return NO_MOVE
+    return move[0] << 5 | move[1]
+
+
+class TranspositionTable(object):
+    """
+    Transpoziciona tabela fiksne velicine, smestena u unapred alocirane nizove.
+    Svaka korpa ima dva mesta: prvo cuva dublji unos, drugo se uvek zamenjuje.
+    - `size_mb`: velicina tabele u megabajtima
+    """
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        self.buckets = max(1, size_mb * 1024 * 1024 // (2 * ENTRY_SIZE))
+        entries = 2 * self.buckets
+        # ceo kljuc, da bi se unosi mogli sacuvati u fajl i ucitati u tabelu druge velicine
+        self.keys = array('Q', [0]) * entries
+        self.depths = array('b', [EMPTY]) * entries
+        self.scores = array('d', [0.0]) * entries
+        self.flags = array('B', [EXACT]) * entries
+        self.moves = array('H', [NO_MOVE]) * entries
+        self.ages = array('B', [0]) * entries
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """
+        Funkcija oznacava pocetak nove pretrage, pa unosi iz prethodnih postaju prvi za zamenu.
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        entries = 2 * self.buckets
+        self.depths = array('b', [EMPTY]) * entries
+        self.age = 0
+
+    def entries(self):
+        """
+        Generator koji vraca `(kljuc, dubina, skor, granica, kod poteza)` za sve popunjene unose.
+        """
+        keys, depths, scores, flags, moves = self.keys, self.depths, self.scores, self.flags, self.moves
+        for slot in range(len(depths)):
+            if depths[slot] != EMPTY:
+                yield keys[slot], depths[slot], scores[slot], flags[slot], moves[slot]
+
+    def probe(self, key):
+        """
+        Funkcija vraca `(dubina, skor, granica, kod poteza)` za zadati kljuc ili None.
+        """
+        self.probes += 1
+        slot = 2 * (key % self.buckets)
+        depths = self.depths
+        if depths[slot] == EMPTY or self.keys[slot] != key:
+            slot += 1
+            if depths[slot] == EMPTY or self.keys[slot] != key:
+                return None
+        self.hits += 1
+        return depths[slot], self.scores[slot], self.flags[slot], self.moves[slot]
+
+    def store(self, key, depth, score, flag, move_code):
+        """
+        Funkcija upisuje rezultat pretrage pozicije.
+        Prvo mesto u korpi se zamenjuje ako je unos za istu poziciju, iz stare pretrage
+        ili plici od novog; u suprotnom se upisuje na drugo mesto.
+        - `key`: zobrist kljuc pozicije
+        - `depth`: dubina do koje je pozicija pretrazena
+        - `score`: dobijeni skor
+        - `flag`: EXACT, LOWER (skor je donja granica) ili UPPER (skor je gornja granica)
+        - `move_code`: najbolji potez, spakovan sa `encode_move`
+        """
+        slot = 2 * (key % self.buckets)
+        depths = self.depths
+        if not (depths[slot] == EMPTY or self.keys[slot] == key
+                or self.ages[slot] != self.age or depth >= depths[slot]):
+            slot += 1
+        elif self.keys[slot] == key and depths[slot] > depth and self.ages[slot] == self.age:
+            return
+        self.keys[slot] = key
+        depths[slot] = depth
+        self.scores[slot] = score
+        self.flags[slot] = flag
+        self.moves[slot] = move_code
+        self.ages[slot] = self.age
+
+def attach_shared_memory(name):
+    """
+    Funkcija otvara postojeci blok deljene memorije u procesu radniku.
+    Kod 'spawn' pokretanja radnik ima svoj resource_tracker koji bi obrisao blok kada se radnik
+    zavrsi, pa se blok odjavljuje; kod 'fork' pokretanja tracker je zajednicki sa roditeljem.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    if multiprocessing.get_start_method() != 'fork':
+        resource_tracker.unregister(memory._name, 'shared_memory')
+    return memory
+
+
+class SharedTranspositionTable(object):
+    """
+    Transpoziciona tabela u deljenoj memoriji (`multiprocessing.shared_memory`), koju vise
+    procesa pretrage cita i pise bez zakljucavanja.
+    Unos zauzima tri 64-bitne reci: `kljuc ^ podaci ^ skor`, podaci (dubina, granica, potez, starost)
+    i bitovi skora. Unos se prihvata samo ako XOR sve tri reci daje trazeni kljuc, pa se
+    delimicno upisan unos iz drugog procesa odbacuje umesto da vrati pogresan skor.
+    - `size_mb`: velicina tabele u megabajtima
+    - `name`: ime postojeceg bloka deljene memorije; ako nije zadato, pravi se novi blok
+    """
+    def __init__(self, size_mb=16, name=None):
+        self.size_mb = size_mb
+        self.buckets = max(1, size_mb * 1024 * 1024 // (2 * 3 * 8))
+        size = self.buckets * 2 * 3 * 8
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = attach_shared_memory(name)
+        self.name = self.memory.name
+        self.words = self.memory.buf[:size].cast('Q')
+        self.floats = self.memory.buf[:size].cast('d')
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def close(self):
+        """
+        Funkcija odvaja tabelu od deljene memorije; proces koji je napravio blok ga i brise.
+        """
+        self.words.release()
+        self.floats.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def new_search(self):
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        self.memory.buf[:len(self.words) * 8] = bytes(len(self.words) * 8)
+        self.age = 0
+
+    def entries(self):
+        """
+        Generator koji vraca `(kljuc, dubina, skor, granica, kod poteza)` za sve popunjene unose.
+        """
+        words, floats = self.words, self.floats
+        for index in range(0, len(words), 3):
+            data = words[index + 1]
+            if data:
+                yield words[index] ^ data ^ words[index + 2], (data & 0xFF) - 1, floats[index + 2], (data >> 8) & 0x3, (data >> 10) & 0xFFFF
+
+    def probe(self, key):
+        """
+        Funkcija vraca `(dubina, skor, granica, kod poteza)` za zadati kljuc ili None.
+        """
+        self.probes += 1
+        words = self.words
+        index = 6 * (key % self.buckets)
+        for index in (index, index + 3):
+            data = words[index + 1]
+            if data and words[index] ^ data ^ words[index + 2] == key:
+                score = self.floats[index + 2]
+                if words[index] ^ data ^ words[index + 2] != key:
+                    continue
+                self.hits += 1
+                return (data & 0xFF) - 1, score, (data >> 8) & 0x3, (data >> 10) & 0xFFFF
+        return None
+
+    def store(self, key, depth, score, flag, move_code):
+        """
+        Funkcija upisuje rezultat pretrage pozicije, sa istim pravilima zamene kao `TranspositionTable.store`.
+        """
+        words = self.words
+        index = 6 * (key % self.buckets)
+        data = words[index + 1]
+        same = data and words[index] ^ data ^ words[index + 2] == key
+        if data and not same and ((data >> 26) & 0xFF) == self.age and depth < (data & 0xFF) - 1:
+            index += 3
+        elif same and ((data >> 26) & 0xFF) == self.age and (data & 0xFF) - 1 > depth:
+            return
+        data = (depth + 1) | flag << 8 | move_code << 10 | self.age << 26
+        # provera se racuna iz lokalnih vrednosti, a ne ponovnim citanjem skora iz deljene memorije,
+        # jer bi izmedju upisa i citanja drugi proces mogao da upise svoj skor u isti unos
+        score_bits = struct.unpack('<Q', struct.pack('<d', score))[0]
+        self.floats[index + 2] = score
+        words[index + 1] = data
+        words[index] = key ^ data ^ score_bits
+
+def save_table(table, path, min_depth=MIN_SAVE_DEPTH):
+    """
+    Funkcija cuva unose tabele dubine bar `min_depth` u fajl, od najdubljeg ka najplicem, i vraca broj unosa.
+    Fajl se prvo upisuje pod privremenim imenom, pa prekinuto cuvanje ne kvari postojeci fajl.
+    - `table`: `TranspositionTable` ili `SharedTranspositionTable`
+    """
+    entries = [entry for entry in table.entries() if entry[1] >= min_depth and math.isfinite(entry[2])]
+    entries.sort(key=lambda entry: entry[1], reverse=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, ZOBRIST_VERSION, ZOBRIST_SEED, len(entries)))
+        for key, depth, score, flag, move_code in entries:
+            f.write(TABLE_RECORD.pack(key, round(score * EVAL_SCALE), move_code, depth, flag))
+    os.replace(temporary, path)
+    return len(entries)
+
+def load_table(table, path, time_limit=None, chunk=4096):
+    """
+    Funkcija upisuje unose iz fajla koji je napravio `save_table` u tabelu i vraca broj ucitanih unosa.
+    Tabela moze biti druge velicine nego kada je sacuvana. Najdublji unosi se ucitavaju prvi,
+    a ucitavanje se prekida posle `time_limit` sekundi, pa pokretanje traje ograniceno vreme i sa velikim fajlom.
+    - `table`: `TranspositionTable` ili `SharedTranspositionTable`
+    """
+    start_time = time.monotonic()
+    loaded = 0
+    with open(path, 'rb') as f:
+        header = f.read(TABLE_HEADER.size)
+        if len(header) < TABLE_HEADER.size:
+            raise ValueError(f"{path} nije fajl transpozicione tabele")
+        magic, version, zobrist_version, seed, count = TABLE_HEADER.unpack(header)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} nije fajl transpozicione tabele verzije {TABLE_VERSION}")
+        if zobrist_version != ZOBRIST_VERSION or seed != ZOBRIST_SEED:
+            raise ValueError(f"{path} je sacuvan sa drugim zobrist kljucevima")
+        store = table.store
+        while loaded < count:
+            data = f.read(TABLE_RECORD.size * chunk)
+            if not data:
+                break
+            for key, score, move_code, depth, flag in TABLE_RECORD.iter_unpack(data[:len(data) - len(data) % TABLE_RECORD.size]):
+                store(key, depth, score / EVAL_SCALE, flag, move_code)
+            loaded += len(data) // TABLE_RECORD.size
+            if time_limit is not None and time.monotonic() - start_time > time_limit:
+                break
+    return min(loaded, count)
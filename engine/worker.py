@@ -0,0 +1,95 @@
+import threading
+import time
+from .search import Search
+
+
+class SearchWorker(object):
+    """
+    Pokrece pretragu u pozadinskoj niti, tako da petlja grafickog interfejsa ne stoji dok racunar razmislja.
+    Rezultat se dobavlja sa `poll`, a pretraga se prekida sa `cancel`.
+    - `search`: pretraga koja se koristi; ista se koristi za sve poteze, pa se cuva transpoziciona tabela
+    """
+    def __init__(self, search=None):
+        self.search = search if search is not None else Search()
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.done = False
+        self.start_time = 0
+        self.elapsed = 0
+
+    def start(self, board, max_depth, mode):
+        """
+        Funkcija pokrece pretragu zadate pozicije u novoj niti.
+        - `board`: pozicija kao `BitBoard`; ne sme se menjati dok pretraga traje
+        - `max_depth`: najveca dubina pretrage
+        - `mode`: 1 ako je jedenje obavezno, 0 ako nije
+        """
+        if not self.idle():
+            raise RuntimeError("Pretraga je vec pokrenuta ili njen rezultat nije preuzet")
+        self.cancel_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.done = False
+        self.start_time = time.time()
+        self.thread = threading.Thread(target=self._run, args=(board, max_depth, mode, self.cancel_event), daemon=True)
+        self.thread.start()
+
+    def _run(self, board, max_depth, mode, cancel_event):
+        try:
+            self.result = self.search.run(board, max_depth, mode, cancel_event)
+        except Exception as error:
+            # greska se prenosi u nit grafickog interfejsa kroz `poll`, inace bi pretraga zauvek izgledala nezavrseno
+            self.error = error
+        finally:
+            self.elapsed = time.time() - self.start_time
+            self.done = True
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def idle(self):
+        """
+        Funkcija vraca True ako nijedna pretraga nije pokrenuta i nema rezultata koji ceka na `poll`.
+        Nit se zaboravlja tek u `poll` ili `cancel`, pa pretraga koja se upravo zavrsila nije u stanju mirovanja
+        dok se njen rezultat ne preuzme.
+        """
+        return self.thread is None
+
+    def poll(self):
+        """
+        Funkcija vraca `(True, potez)` ako je pretraga zavrsena, inace `(False, None)`.
+        Rezultat se vraca samo jednom. Ako je pretraga podigla izuzetak, on se ovde ponovo podize,
+        a radnik je posle toga slobodan za novu pretragu.
+        """
+        if not self.done:
+            return False, None
+        self.done = False
+        self.thread = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return True, self.result
+
+    def cancel(self, timeout=None):
+        """
+        Funkcija prekida pretragu i ceka da se nit zavrsi.
+        """
+        self.cancel_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.thread = None
+        self.done = False
+
+    @property
+    def depth(self):
+        return self.search.depth
+
+    @property
+    def nodes(self):
+        return self.search.nodes
+
+    @property
+    def stats(self):
+        return self.search.stats
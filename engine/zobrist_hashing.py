@@ -0,0 +1,37 @@
+import random
+from array import array
+from .constants import ROWS, COLS, WHITE
+
+# kljucevi su isti u svim procesima i pokretanjima, pa je i pretraga sa istim podesavanjima ponovljiva
+# i sacuvani kljucevi (npr. transpoziciona tabela u fajlu) vaze i posle ponovnog pokretanja;
+# verzija se menja kad god se promeni nacin na koji se kljucevi prave
+ZOBRIST_SEED = 20240325
+ZOBRIST_VERSION = 2
+SQUARES = ROWS * COLS // 2
+
+# vrste figura; kljuc figure vrste `piece` na polju `sq` je `zobrist_keys[piece * SQUARES + sq]`
+WHITE_PAWN, WHITE_QUEEN, BROWN_PAWN, BROWN_QUEEN = range(4)
+PIECE_TYPES = 4
+
+def piece_type(color, queen):
+    if color == WHITE:
+        return WHITE_QUEEN if queen else WHITE_PAWN
+    return BROWN_QUEEN if queen else BROWN_PAWN
+
+def key_index(row, col, piece):
+    """
+    Funkcija vraca indeks kljuca figure vrste `piece` na tamnom polju `(row, col)` u `zobrist_keys`.
+    Polja su numerisana kao u `bitboard.square`.
+    """
+    return piece * SQUARES + row * (COLS // 2) + col // 2
+
+def initialize_zobrist(seed=ZOBRIST_SEED):
+    """
+    Funkcija vraca `(kljucevi figura, kljuc igraca na potezu, kljuc rezima)` za zadato seme.
+    Kljucevi figura su niz 64-bitnih brojeva sa `PIECE_TYPES * SQUARES` elemenata.
+    """
+    rng = random.Random(seed)
+    keys = array('Q', (rng.getrandbits(64) for _ in range(PIECE_TYPES * SQUARES)))
+    return keys, rng.getrandbits(64), rng.getrandbits(64)
+
+zobrist_keys, zobrist_side, zobrist_mode = initialize_zobrist()
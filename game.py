@@ -13,6 +13,8 @@ class Game(object):
         self.mode = mode
         self.old_position = None
         self.new_position = None
+        self.status = None
+        self.font = None
 
     def update(self):
         """
@@ -22,6 +24,8 @@ class Game(object):
         self.draw_valid_moves(self.valid_moves)
         if self.old_position and self.new_position:
             self.draw_diff_pos(self.old_position, self.new_position)
+        if self.status:
+            self.draw_status(self.status)
         pygame.display.update()
 
     def select(self, row, col, mode):
@@ -99,6 +103,18 @@ class Game(object):
         else:
             self.turn = BROWN
     
+    def draw_status(self, text):
+        """
+        Funkcija koja ispisuje poruku o stanju pretrage u gornjem levom uglu table.
+
+        - `text`: poruka koja se ispisuje
+        """
+        if self.font is None:
+            self.font = pygame.font.SysFont(None, 30)
+        rendered = self.font.render(text, True, BLACK)
+        pygame.draw.rect(self.win, BEIGE, (0, 0, rendered.get_width() + 10, rendered.get_height() + 6))
+        self.win.blit(rendered, (5, 3))
+
     def draw_winner(self):
         """
         Funkcija koja ispisuje pobednika na ekranu.
@@ -1,9 +1,19 @@
+import os
+import traceback
 import pygame
 from constants import *
 from game import Game
-from algorithm import alpha_beta_pruning
+from algorithm import make_move
+from engine.bitboard import BitBoard
+from engine.book import OpeningBook
+from engine.search import Search
+from engine.transposition import TranspositionTable, load_table, save_table
+from engine.worker import SearchWorker
 
 FPS = 60
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin')
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'table.bin')
+TABLE_LOAD_TIME = 0.5
 
 WIN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption('Checkers')
@@ -67,6 +77,14 @@ def main():
     run = True
     clock = pygame.time.Clock()
     game = Game(WIN, mode)
+    book = OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+    table = TranspositionTable()
+    if os.path.exists(TABLE_PATH):
+        try:
+            load_table(table, TABLE_PATH, TABLE_LOAD_TIME)
+        except ValueError as error:
+            print(error)
+    worker = SearchWorker(Search(table, book=book))
 
     while run:
         clock.tick(FPS)
@@ -77,18 +95,38 @@ def main():
             pygame.time.delay(2500)
             run = False
 
-        if game.turn == WHITE:
-            best_move, moved_piece = alpha_beta_pruning(game.board, 7, game.turn, mode)
-            game.ai_move(best_move, moved_piece)
+        if run and game.turn == WHITE:
+            try:
+                finished, best_move = worker.poll()
+            except Exception:
+                # neispravna knjiga otvaranja je najcesci uzrok; pretraga se ponavlja bez nje,
+                # a ako ni to ne pomogne, greska prekida program umesto da racunar zauvek "razmislja"
+                if worker.search.book is None:
+                    raise
+                traceback.print_exc()
+                worker.search.book = None
+                finished, best_move = False, None
+            if finished:
+                print(f"Time taken: {worker.elapsed}")
+                game.status = None
+                best_move, moved_piece = make_move(game.board, best_move)
+                game.ai_move(best_move, moved_piece)
+            elif worker.idle():
+                worker.start(BitBoard.from_board(game.board, game.turn), 7, mode)
+            if game.turn == WHITE:
+                game.status = f"Thinking... depth {worker.depth}, {worker.nodes} nodes"
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                worker.cancel()
                 run = False
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN and game.turn != WHITE:
                 row, col = get_row_col_from_mouse(pygame.mouse.get_pos())
                 game.select(row, col, mode)
         game.update()
+    worker.cancel()
+    save_table(table, TABLE_PATH)
     pygame.quit()
 
 if __name__ == '__main__':